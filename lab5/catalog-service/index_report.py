@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Скрипт для проверки индексов каталога.
+Создает индексы приложения, выполняет explain() для каждой формы запроса
+репозиториев и печатает планы; запросы со сканированием всей коллекции
+(COLLSCAN) помечаются, а код возврата становится 1:
+
+    python index_report.py
+"""
+
+import asyncio
+import sys
+import os
+
+# Добавляем src в path для импорта модулей
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.infrastructure.database import connect_to_mongo, close_mongo_connection, get_database
+from src.infrastructure.index_advisor import print_index_report
+
+
+async def main() -> int:
+    """Главная функция"""
+    await connect_to_mongo()
+    try:
+        ok = await print_index_report(get_database())
+    finally:
+        close_mongo_connection()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
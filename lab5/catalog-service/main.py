@@ -1,9 +1,13 @@
+import asyncio
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.presentation.controllers import router as catalog_router
-from src.infrastructure.database import connect_to_mongo, close_mongo_connection, get_database
-from src.infrastructure.repositories import MongoServiceCategoryRepository, MongoServiceRepository
+from src.infrastructure.database import connect_to_mongo, close_mongo_connection, get_database, bump_categories_version
+from src.infrastructure.redis_client import redis_client
+from src.infrastructure.category_snapshot import category_snapshot
+from src.infrastructure.index_advisor import print_index_report
 from src.domain.entities import ServiceCategory, Service
 
 # Создание приложения FastAPI
@@ -25,6 +29,9 @@ app.add_middleware(
 # Подключение роутеров
 app.include_router(catalog_router, prefix="/api/v1")
 
+# Фоновая задача, поддерживающая актуальность снимка категорий
+category_refresh_task = None
+
 
 @app.get("/")
 async def root():
@@ -38,19 +45,14 @@ async def health_check():
     return {"status": "healthy"}
 
 
-def seed_data():
+async def seed_data():
     """Наполнение БД тестовыми данными"""
     try:
         database = get_database()
         
-        # Инициализация репозиториев
-        category_repo = MongoServiceCategoryRepository(database)
-        service_repo = MongoServiceRepository(database)
-        
         # Проверяем, есть ли уже данные
-        # Создаем синхронную функцию для проверки данных
         categories_collection = database.categories
-        existing_count = categories_collection.count_documents({})
+        existing_count = await categories_collection.count_documents({})
         if existing_count > 0:
             print("Test data already exists, skipping seed")
             return
@@ -79,17 +81,21 @@ def seed_data():
             }
         ]
         
-        created_categories = []
-        for cat_data in categories_data:
-            category = ServiceCategory(
+        # Вставляем все категории одним запросом напрямую через коллекцию
+        category_docs = [
+            ServiceCategory(
                 name=cat_data["name"],
                 description=cat_data["description"]
-            )
-            # Создаем категорию напрямую через коллекцию
-            category_dict = category.to_dict()
-            result = categories_collection.insert_one(category_dict)
-            created_doc = categories_collection.find_one({"_id": result.inserted_id})
-            created_category = ServiceCategory.from_dict(created_doc)
+            ).to_dict()
+            for cat_data in categories_data
+        ]
+        result = await categories_collection.insert_many(category_docs)
+        await bump_categories_version(database)
+        
+        created_categories = []
+        for category_doc, inserted_id in zip(category_docs, result.inserted_ids):
+            category_doc["_id"] = inserted_id
+            created_category = ServiceCategory.from_dict(category_doc)
             created_categories.append(created_category)
             print(f"Created category: {created_category.name}")
         
@@ -162,22 +168,21 @@ def seed_data():
         category_map = {cat.name: cat.id for cat in created_categories}
         
         services_collection = database.services
-        for service_data in services_data:
-            category_id = category_map[service_data["category"]]
-            service = Service(
-                category_id=category_id,
+        service_docs = [
+            Service(
+                category_id=category_map[service_data["category"]],
                 name=service_data["name"],
                 description=service_data["description"],
                 price_from=service_data["price_from"],
                 price_to=service_data["price_to"],
                 duration_minutes=service_data["duration_minutes"]
-            )
-            # Создаем услугу напрямую через коллекцию
-            service_dict = service.to_dict()
-            result = services_collection.insert_one(service_dict)
-            created_doc = services_collection.find_one({"_id": result.inserted_id})
-            created_service = Service.from_dict(created_doc)
-            print(f"Created service: {created_service.name}")
+            ).to_dict()
+            for service_data in services_data
+        ]
+        # Вставляем все услуги одним запросом напрямую через коллекцию
+        await services_collection.insert_many(service_docs)
+        for service_doc in service_docs:
+            print(f"Created service: {service_doc['name']}")
         
         print("Test data seeded successfully!")
         
@@ -192,13 +197,37 @@ async def startup_event():
     
     # Подключаемся к MongoDB
     try:
-        connect_to_mongo()
+        await connect_to_mongo()
         print("Connected to MongoDB")
     except Exception as e:
         print(f"Error connecting to MongoDB: {e}")
     
+    # Подключаемся к Redis (без него каталог работает напрямую с MongoDB)
+    try:
+        await redis_client.connect()
+        print("Connected to Redis")
+    except Exception as e:
+        redis_client.redis = None
+        print(f"Error connecting to Redis: {e}")
+    
     # Наполняем тестовыми данными
-    seed_data()
+    await seed_data()
+    
+    # Отчет по планам запросов каталога (включается CATALOG_INDEX_REPORT=on)
+    if os.getenv("CATALOG_INDEX_REPORT", "off").lower() in ("1", "on", "true", "yes"):
+        try:
+            await print_index_report(get_database())
+        except Exception as e:
+            print(f"Error building index report: {e}")
+    
+    # Загружаем снимок категорий и запускаем его обновление
+    global category_refresh_task
+    try:
+        await category_snapshot.load(get_database())
+        print("Category snapshot loaded")
+    except Exception as e:
+        print(f"Error loading category snapshot: {e}")
+    category_refresh_task = asyncio.create_task(category_snapshot.keep_fresh(get_database()))
     
     print("Catalog Service started successfully")
 
@@ -207,7 +236,13 @@ async def startup_event():
 async def shutdown_event():
     """События при остановке приложения"""
     print("Shutting down Catalog Service...")
+    
+    # Останавливаем обновление снимка категорий
+    if category_refresh_task:
+        category_refresh_task.cancel()
+    
     close_mongo_connection()
+    await redis_client.disconnect()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from .entities import Service, ServiceCategory
+from .entities import Service, ServiceCategory, ServiceSummary, ServiceBrowseResult, CategoryFacet, PriceBucket
 from .exceptions import (
     CatalogDomainException,
     ServiceNotFoundException,
@@ -12,6 +12,10 @@ from .exceptions import (
 __all__ = [
     "Service", 
     "ServiceCategory", 
+    "ServiceSummary",
+    "ServiceBrowseResult",
+    "CategoryFacet",
+    "PriceBucket",
     "CatalogDomainException",
     "ServiceNotFoundException",
     "CategoryNotFoundException",
@@ -101,4 +101,93 @@ class Service:
         if isinstance(data.get('updated_at'), str):
             data['updated_at'] = datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00'))
         
-        return cls(**data) 
\ No newline at end of file
+        return cls(**data) 
+
+@dataclass(slots=True)
+class ServiceSummary:
+    """Краткое представление услуги для списков (без описания и дат)"""
+    id: str
+    category_id: str
+    name: str
+    price_from: Optional[float] = None
+    price_to: Optional[float] = None
+    duration_minutes: Optional[int] = None
+    is_active: bool = True
+    
+    # Проекция MongoDB: из коллекции читаются только эти поля
+    PROJECTION = {
+        "category_id": 1,
+        "name": 1,
+        "price_from": 1,
+        "price_to": 1,
+        "duration_minutes": 1,
+        "is_active": 1,
+    }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ServiceSummary':
+        """Создание объекта из документа MongoDB, прочитанного с PROJECTION"""
+        return cls(
+            id=str(data["_id"]),
+            category_id=data.get("category_id", ""),
+            name=data.get("name", ""),
+            price_from=data.get("price_from"),
+            price_to=data.get("price_to"),
+            duration_minutes=data.get("duration_minutes"),
+            is_active=data.get("is_active", True),
+        )
+    
+    @classmethod
+    def from_service(cls, service: 'Service') -> 'ServiceSummary':
+        """Краткое представление полной сущности услуги"""
+        return cls(
+            id=service.id,
+            category_id=service.category_id,
+            name=service.name,
+            price_from=service.price_from,
+            price_to=service.price_to,
+            duration_minutes=service.duration_minutes,
+            is_active=service.is_active,
+        )
+
+
+@dataclass
+class CategoryFacet:
+    """Количество услуг категории в выдаче каталога"""
+    category_id: str
+    count: int
+    name: str = ""
+
+
+@dataclass
+class PriceBucket:
+    """Ценовой интервал выдачи каталога (по price_from) и число услуг в нем"""
+    min_price: float
+    max_price: float
+    count: int
+
+
+@dataclass
+class ServiceBrowseResult:
+    """Страница каталога с фасетами по категориям и ценам"""
+    services: List[ServiceSummary] = field(default_factory=list)
+    total: int = 0
+    categories: List[CategoryFacet] = field(default_factory=list)
+    price_buckets: List[PriceBucket] = field(default_factory=list)
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    
+    # Число ценовых интервалов с примерно равным количеством услуг
+    PRICE_BUCKETS = 5
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ServiceBrowseResult':
+        """Создание объекта из словаря (asdict), например из кеша"""
+        return cls(
+            services=[ServiceSummary(**item) for item in data["services"]],
+            total=data["total"],
+            categories=[CategoryFacet(**item) for item in data["categories"]],
+            price_buckets=[PriceBucket(**item) for item in data["price_buckets"]],
+            min_price=data.get("min_price"),
+            max_price=data.get("max_price"),
+        )
@@ -1,5 +1,6 @@
 from .repositories import MongoServiceRepository, MongoServiceCategoryRepository
 from .memory_repositories import InMemoryServiceRepository, InMemoryCategoryRepository
+from .cached_repositories import CachedServiceRepository
 from .database import get_database, connect_to_mongo, close_mongo_connection
 
 __all__ = [
@@ -7,6 +8,7 @@ __all__ = [
     "MongoServiceCategoryRepository", 
     "InMemoryServiceRepository",
     "InMemoryCategoryRepository",
+    "CachedServiceRepository",
     "get_database",
     "connect_to_mongo", 
     "close_mongo_connection"
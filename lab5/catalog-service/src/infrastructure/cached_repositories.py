@@ -0,0 +1,170 @@
+import os
+from dataclasses import asdict
+from typing import Optional, List
+
+from ..domain.entities import Service, ServiceSummary, ServiceBrowseResult, CategoryFacet
+from ..repository.interfaces import ServiceRepository
+from .redis_client import RedisClient
+
+# TTL кеша каталога в секундах
+CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", "300"))
+
+
+def _entity_to_cache(entity) -> dict:
+    """Преобразование сущности каталога в словарь для кеширования"""
+    data = asdict(entity)
+    for field in ("created_at", "updated_at"):
+        if data.get(field) is not None:
+            data[field] = data[field].isoformat()
+    return data
+
+
+class CachedServiceRepository(ServiceRepository):
+    """Кеширующий репозиторий услуг с паттернами read-through и write-through.
+    
+    Услуга по id кешируется под отдельным ключом и обновляется при записи.
+    Списки, выборки по категории и поиск хранятся под номером поколения
+    catalog:services:gen, который увеличивается при любом изменении услуг,
+    поэтому старые списки перестают читаться сразу и истекают по TTL.
+    """
+    
+    def __init__(self, db_repository: ServiceRepository, redis_client: RedisClient, cache_ttl: int = CATALOG_CACHE_TTL):
+        self.db_repository = db_repository
+        self.redis_client = redis_client
+        self.cache_ttl = cache_ttl
+    
+    def _get_service_cache_key(self, service_id: str) -> str:
+        """Ключ кеша услуги"""
+        return f"catalog:service:{service_id}"
+    
+    def _get_generation_key(self) -> str:
+        """Ключ счетчика поколения списков услуг"""
+        return "catalog:services:gen"
+    
+    async def _get_list_cache_key(self, *parts) -> str:
+        """Ключ кеша списка услуг для текущего поколения"""
+        generation = await self.redis_client.get(self._get_generation_key()) or "0"
+        return f"catalog:services:{generation}:" + ":".join(str(part) for part in parts)
+    
+    async def _get_cached_summaries(self, cache_key: str, load) -> List[ServiceSummary]:
+        """Read-through для списка кратких представлений услуг"""
+        cached = await self.redis_client.get_json(cache_key)
+        if cached is not None:
+            return [ServiceSummary(**item) for item in cached]
+        
+        services = await load()
+        await self.redis_client.set_json(cache_key, [asdict(service) for service in services], self.cache_ttl)
+        return services
+    
+    async def get_all(self, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
+        """Получить все услуги с пагинацией (read-through)"""
+        cache_key = await self._get_list_cache_key("list", limit, offset)
+        return await self._get_cached_summaries(
+            cache_key, lambda: self.db_repository.get_all(limit, offset)
+        )
+    
+    async def get_by_id(self, service_id: str) -> Optional[Service]:
+        """Получить услугу по ID (read-through)"""
+        cache_key = self._get_service_cache_key(service_id)
+        cached = await self.redis_client.get_json(cache_key)
+        if cached is not None:
+            return Service.from_dict(cached)
+        
+        service = await self.db_repository.get_by_id(service_id)
+        if service:
+            await self.redis_client.set_json(cache_key, _entity_to_cache(service), self.cache_ttl)
+        return service
+    
+    async def create(self, service: Service) -> Service:
+        """Создать услугу (write-through)"""
+        created_service = await self.db_repository.create(service)
+        await self.redis_client.write(
+            set_json={self._get_service_cache_key(created_service.id): _entity_to_cache(created_service)},
+            incr=[self._get_generation_key()],
+            expire=self.cache_ttl
+        )
+        return created_service
+    
+    async def update(self, service: Service) -> Service:
+        """Обновить услугу (write-through)"""
+        updated_service = await self.db_repository.update(service)
+        await self.redis_client.write(
+            set_json={self._get_service_cache_key(updated_service.id): _entity_to_cache(updated_service)},
+            incr=[self._get_generation_key()],
+            expire=self.cache_ttl
+        )
+        return updated_service
+    
+    async def delete(self, service_id: str) -> bool:
+        """Удалить услугу с инвалидацией кеша"""
+        deleted = await self.db_repository.delete(service_id)
+        if deleted:
+            await self.redis_client.write(
+                delete=[self._get_service_cache_key(service_id)],
+                incr=[self._get_generation_key()]
+            )
+        return deleted
+    
+    async def get_by_category_id(self, category_id: str, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
+        """Получить услуги по ID категории (read-through)"""
+        cache_key = await self._get_list_cache_key("category", category_id, limit, offset)
+        return await self._get_cached_summaries(
+            cache_key, lambda: self.db_repository.get_by_category_id(category_id, limit, offset)
+        )
+    
+    async def browse(
+        self,
+        category_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ServiceBrowseResult:
+        """Страница услуг с фасетами (read-through по ключу фильтра)"""
+        cache_key = await self._get_list_cache_key(
+            "browse", category_id or "", "" if min_price is None else min_price,
+            "" if max_price is None else max_price, limit, offset
+        )
+        cached = await self.redis_client.get_json(cache_key)
+        if cached is not None:
+            return ServiceBrowseResult.from_dict(cached)
+        
+        result = await self.db_repository.browse(category_id, min_price, max_price, limit, offset)
+        await self.redis_client.set_json(cache_key, asdict(result), self.cache_ttl)
+        return result
+    
+    async def count_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[CategoryFacet]:
+        """Количество услуг по категориям (read-through, общий ключ для всех категорий и страниц)"""
+        cache_key = await self._get_list_cache_key(
+            "category-counts", "" if min_price is None else min_price, "" if max_price is None else max_price
+        )
+        cached = await self.redis_client.get_json(cache_key)
+        if cached is not None:
+            return [CategoryFacet(**item) for item in cached]
+        
+        facets = await self.db_repository.count_by_category(min_price, max_price)
+        await self.redis_client.set_json(cache_key, [asdict(facet) for facet in facets], self.cache_ttl)
+        return facets
+    
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[ServiceSummary]:
+        """Поиск услуг по названию и описанию (read-through)"""
+        cache_key = await self._get_list_cache_key("search", limit, offset, name.lower())
+        return await self._get_cached_summaries(
+            cache_key, lambda: self.db_repository.search_by_name(name, limit, offset)
+        )
+    
+    async def count_by_name(self, name: str) -> int:
+        """Количество услуг, найденных поиском (read-through)"""
+        cache_key = await self._get_list_cache_key("search-count", name.lower())
+        cached = await self.redis_client.get(cache_key)
+        if cached is not None:
+            return int(cached)
+        
+        total = await self.db_repository.count_by_name(name)
+        await self.redis_client.set(cache_key, str(total), self.cache_ttl)
+        return total
+
@@ -0,0 +1,147 @@
+import os
+import asyncio
+from dataclasses import replace
+from typing import Optional, List, Dict
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+from ..domain.entities import ServiceCategory
+from ..repository.interfaces import ServiceCategoryRepository
+from .database import get_categories_version
+
+
+class CategorySnapshot:
+    """Снимок всех категорий в памяти процесса.
+    
+    Категорий мало и меняются они редко, поэтому чтения обслуживаются
+    целиком из памяти. Снимок перечитывается по событиям change stream
+    коллекции categories, а если он недоступен (одиночный mongod без
+    replica set) - при изменении версии в catalog_meta.
+    """
+    
+    def __init__(self, poll_interval: float = 5.0):
+        self.poll_interval = poll_interval
+        self.version: Optional[int] = None
+        self._by_id: Dict[str, ServiceCategory] = {}
+        self._by_name: Dict[str, ServiceCategory] = {}
+    
+    @property
+    def loaded(self) -> bool:
+        """Снимок загружен и может обслуживать чтения"""
+        return self.version is not None
+    
+    async def load(self, database: AsyncIOMotorDatabase):
+        """Перечитать все категории из MongoDB"""
+        # Версия читается до категорий: изменение во время загрузки вызовет повторную
+        version = await get_categories_version(database)
+        docs = await database.categories.find({}).to_list(length=None)
+        self._replace([ServiceCategory.from_dict(doc) for doc in docs])
+        self.version = version
+    
+    def _replace(self, categories: List[ServiceCategory]):
+        self._by_id = {category.id: category for category in categories}
+        self._by_name = {category.name: category for category in categories}
+    
+    def put(self, category: ServiceCategory):
+        """Применить запись этого процесса к снимку"""
+        categories = [c for c in self._by_id.values() if c.id != category.id]
+        self._replace(categories + [replace(category)])
+    
+    def remove(self, category_id: str):
+        """Применить удаление этого процесса к снимку"""
+        self._replace([c for c in self._by_id.values() if c.id != category_id])
+    
+    def get_all(self) -> List[ServiceCategory]:
+        """Все активные категории (копии, снимок не изменяется вызывающим кодом)"""
+        return [replace(c) for c in self._by_id.values() if c.is_active]
+    
+    def get_by_id(self, category_id: str) -> Optional[ServiceCategory]:
+        """Категория по ID"""
+        category = self._by_id.get(category_id)
+        return replace(category) if category else None
+    
+    def get_by_name(self, name: str) -> Optional[ServiceCategory]:
+        """Категория по названию"""
+        category = self._by_name.get(name)
+        return replace(category) if category else None
+    
+    async def keep_fresh(self, database: AsyncIOMotorDatabase):
+        """Поддерживать снимок актуальным: change stream, иначе опрос версии"""
+        try:
+            async with database.categories.watch() as stream:
+                print("Category snapshot: watching change stream")
+                # События изменений пришли после открытия потока - перечитываем снимок
+                await self.load(database)
+                async for _ in stream:
+                    await self.load(database)
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as e:
+            print(f"Category snapshot: change stream unavailable ({e}), polling version")
+        
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if not self.loaded or await get_categories_version(database) != self.version:
+                    await self.load(database)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Category snapshot refresh error: {e}")
+
+
+class SnapshotCategoryRepository(ServiceCategoryRepository):
+    """Репозиторий категорий, читающий из снимка в памяти.
+    
+    Записи идут в MongoDB и сразу применяются к снимку этого процесса;
+    пока снимок не загружен, чтения также идут в MongoDB.
+    """
+    
+    def __init__(self, db_repository: ServiceCategoryRepository, snapshot: CategorySnapshot):
+        self.db_repository = db_repository
+        self.snapshot = snapshot
+    
+    async def get_all(self) -> List[ServiceCategory]:
+        """Получить все активные категории"""
+        if self.snapshot.loaded:
+            return self.snapshot.get_all()
+        return await self.db_repository.get_all()
+    
+    async def get_by_id(self, category_id: str) -> Optional[ServiceCategory]:
+        """Получить категорию по ID"""
+        if self.snapshot.loaded:
+            return self.snapshot.get_by_id(category_id)
+        return await self.db_repository.get_by_id(category_id)
+    
+    async def get_by_name(self, name: str) -> Optional[ServiceCategory]:
+        """Получить категорию по названию"""
+        if self.snapshot.loaded:
+            return self.snapshot.get_by_name(name)
+        return await self.db_repository.get_by_name(name)
+    
+    async def create(self, category: ServiceCategory) -> ServiceCategory:
+        """Создать категорию"""
+        created_category = await self.db_repository.create(category)
+        self.snapshot.put(created_category)
+        return created_category
+    
+    async def update(self, category: ServiceCategory) -> ServiceCategory:
+        """Обновить категорию"""
+        updated_category = await self.db_repository.update(category)
+        self.snapshot.put(updated_category)
+        return updated_category
+    
+    async def delete(self, category_id: str) -> bool:
+        """Удалить категорию"""
+        deleted = await self.db_repository.delete(category_id)
+        if deleted:
+            self.snapshot.remove(category_id)
+        return deleted
+
+
+# Глобальный снимок категорий (интервал опроса версии задается через окружение)
+category_snapshot = CategorySnapshot(
+    poll_interval=float(os.getenv("CATEGORY_SNAPSHOT_POLL_INTERVAL", "5")),
+)
+
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Any, Dict
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .repositories import FindQuery, MongoServiceRepository, MongoServiceCategoryRepository
+
+
+# Анализ планов запросов репозиториев каталога через explain().
+# Формы запросов (фильтр, сортировка, skip и limit) строятся теми же методами
+# *_query, что и запросы MongoServiceRepository и MongoServiceCategoryRepository.
+
+@dataclass
+class QueryPlanReport:
+    """План выполнения одной формы запроса"""
+    collection: str
+    query: str
+    stages: List[str] = field(default_factory=list)
+    indexes: List[str] = field(default_factory=list)
+    keys_examined: Optional[int] = None
+    docs_examined: Optional[int] = None
+    returned: Optional[int] = None
+    
+    @property
+    def collscan(self) -> bool:
+        """Запрос читает коллекцию целиком"""
+        return "COLLSCAN" in self.stages
+    
+    def format(self) -> str:
+        """Строка отчета"""
+        status = "COLLSCAN" if self.collscan else "ok"
+        indexes = ", ".join(self.indexes) or "-"
+        return (
+            f"[{status:<8}] {self.collection}.{self.query}: {' > '.join(self.stages)} "
+            f"(indexes: {indexes}; keys {self.keys_examined}, docs {self.docs_examined}, returned {self.returned})"
+        )
+
+
+def _collect_stages(plan: Dict[str, Any], report: QueryPlanReport):
+    """Обойти дерево плана от корня к листьям"""
+    # В планах движка SBE дерево лежит под queryPlan
+    plan = plan.get("queryPlan", plan)
+    report.stages.append(plan.get("stage", "?"))
+    if plan.get("indexName"):
+        report.indexes.append(plan["indexName"])
+    children = plan.get("inputStages") or ([plan["inputStage"]] if "inputStage" in plan else [])
+    for child in children:
+        _collect_stages(child, report)
+
+
+async def _explain(collection, name: str, query: FindQuery) -> QueryPlanReport:
+    """Выполнить explain для формы запроса"""
+    explanation = await query.cursor(collection).explain()
+    
+    report = QueryPlanReport(collection=collection.name, query=name)
+    _collect_stages(explanation["queryPlanner"]["winningPlan"], report)
+    stats = explanation.get("executionStats")
+    if stats:
+        report.keys_examined = stats.get("totalKeysExamined")
+        report.docs_examined = stats.get("totalDocsExamined")
+        report.returned = stats.get("nReturned")
+    return report
+
+
+async def explain_catalog_queries(database: AsyncIOMotorDatabase) -> List[QueryPlanReport]:
+    """Планы всех форм запросов каталога на примерах значений из базы"""
+    services = database.services
+    categories = database.categories
+    
+    service = await services.find_one({}) or {}
+    category = await categories.find_one({}) or {}
+    service_id = str(service.get("_id", ObjectId()))
+    category_id = service.get("category_id", "")
+    price_from = service.get("price_from") or 0
+    price_to = service.get("price_to") or 0
+    search_word = (service.get("name") or "услуга").split()[0]
+    
+    return [
+        await _explain(services, "get_all", MongoServiceRepository.get_all_query()),
+        await _explain(services, "get_by_id", MongoServiceRepository.get_by_id_query(service_id)),
+        await _explain(services, "get_by_category_id", MongoServiceRepository.get_by_category_id_query(category_id)),
+        await _explain(services, "search_by_name", MongoServiceRepository.search_by_name_query(search_word)),
+        await _explain(services, "get_by_price_range", MongoServiceRepository.get_by_price_range_query(price_from, price_to)),
+        await _explain(services, "browse", MongoServiceRepository.browse_query(category_id, price_from)),
+        await _explain(services, "count_by_category", MongoServiceRepository.count_by_category_query(price_from)),
+        await _explain(categories, "get_all", MongoServiceCategoryRepository.get_all_query()),
+        await _explain(categories, "get_by_id", MongoServiceCategoryRepository.get_by_id_query(str(category.get("_id", ObjectId())))),
+        await _explain(categories, "get_by_name", MongoServiceCategoryRepository.get_by_name_query(category.get("name", ""))),
+    ]
+
+async def print_index_report(database: AsyncIOMotorDatabase) -> bool:
+    """Напечатать отчет по планам запросов; True, если нет COLLSCAN"""
+    reports = await explain_catalog_queries(database)
+    for report in reports:
+        print(report.format())
+    
+    collscans = [report for report in reports if report.collscan]
+    if collscans:
+        print(f"{len(collscans)} catalog queries scan whole collections, check create_indexes")
+    return not collscans
+
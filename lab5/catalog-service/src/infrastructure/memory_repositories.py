@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict
 from datetime import datetime
-from ..domain.entities import Service, ServiceCategory
+from ..domain.entities import Service, ServiceCategory, ServiceSummary, ServiceBrowseResult, CategoryFacet, PriceBucket
 from ..repository.interfaces import ServiceRepository, ServiceCategoryRepository
 
 
@@ -37,10 +37,10 @@ class InMemoryServiceRepository(ServiceRepository):
         for service in sample_services:
             self._services[service.id] = service
     
-    async def get_all(self, limit: int = 100, offset: int = 0) -> List[Service]:
+    async def get_all(self, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
         """Получить все услуги с пагинацией"""
         services = list(self._services.values())
-        return services[offset:offset + limit]
+        return [ServiceSummary.from_service(s) for s in services[offset:offset + limit]]
     
     async def get_by_id(self, service_id: str) -> Optional[Service]:
         """Получить услугу по ID"""
@@ -66,13 +66,72 @@ class InMemoryServiceRepository(ServiceRepository):
             return True
         return False
     
-    async def get_by_category_id(self, category_id: str) -> List[Service]:
+    async def get_by_category_id(self, category_id: str, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
         """Получить услуги по ID категории"""
-        return [s for s in self._services.values() if s.category_id == category_id]
+        services = [s for s in self._services.values() if s.category_id == category_id]
+        return [ServiceSummary.from_service(s) for s in services[offset:offset + limit]]
+    
+    async def browse(
+        self,
+        category_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ServiceBrowseResult:
+        """Страница услуг с фасетами"""
+        services = self._filter_active(min_price, max_price)
+        if category_id:
+            services = [s for s in services if s.category_id == category_id]
+        prices_from = sorted(s.price_from for s in services if s.price_from is not None)
+        prices_to = [s.price_to for s in services if s.price_to is not None]
+        
+        # Интервалы с примерно равным числом услуг, как $bucketAuto
+        bucket_size = -(-len(prices_from) // ServiceBrowseResult.PRICE_BUCKETS)
+        buckets = [prices_from[i:i + bucket_size] for i in range(0, len(prices_from), bucket_size or 1)]
+        
+        return ServiceBrowseResult(
+            services=[ServiceSummary.from_service(s) for s in services[offset:offset + limit]],
+            total=len(services),
+            price_buckets=[
+                PriceBucket(min_price=bucket[0], max_price=bucket[-1], count=len(bucket))
+                for bucket in buckets
+            ],
+            min_price=min(prices_from) if prices_from else None,
+            max_price=max(prices_to) if prices_to else None,
+        )
+    
+    async def count_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[CategoryFacet]:
+        """Количество активных услуг по категориям"""
+        counts: Dict[str, int] = {}
+        for s in self._filter_active(min_price, max_price):
+            counts[s.category_id] = counts.get(s.category_id, 0) + 1
+        return [
+            CategoryFacet(category_id=c, count=n)
+            for c, n in sorted(counts.items(), key=lambda item: -item[1])
+        ]
+    
+    def _filter_active(self, min_price: Optional[float], max_price: Optional[float]) -> List[Service]:
+        """Активные услуги в ценовом фильтре"""
+        return [
+            s for s in self._services.values()
+            if s.is_active
+            and (min_price is None or (s.price_from is not None and s.price_from >= min_price))
+            and (max_price is None or (s.price_to is not None and s.price_to <= max_price))
+        ]
     
-    async def search_by_name(self, name: str) -> List[Service]:
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[ServiceSummary]:
         """Поиск услуг по названию"""
-        return [s for s in self._services.values() if name.lower() in s.name.lower()]
+        services = [s for s in self._services.values() if name.lower() in s.name.lower()]
+        return [ServiceSummary.from_service(s) for s in services[offset:offset + limit]]
+    
+    async def count_by_name(self, name: str) -> int:
+        """Количество услуг, найденных поиском по названию"""
+        return sum(1 for s in self._services.values() if name.lower() in s.name.lower())
 
 
 class InMemoryCategoryRepository(ServiceCategoryRepository):
@@ -118,4 +177,8 @@ class InMemoryCategoryRepository(ServiceCategoryRepository):
         if category_id in self._categories:
             del self._categories[category_id]
             return True
-        return False 
\ No newline at end of file
+        return False
+    
+    async def get_by_name(self, name: str) -> Optional[ServiceCategory]:
+        """Получить категорию по названию"""
+        return next((c for c in self._categories.values() if c.name == name), None) 
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+import json
+from typing import Optional, Any, List
+import redis.asyncio as redis
+
+
+class RedisClient:
+    """Redis клиент для кеширования каталога"""
+    
+    def __init__(self):
+        self.redis: Optional[redis.Redis] = None
+    
+    async def connect(self):
+        """Установить соединение с Redis"""
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/1")
+        self.redis = redis.from_url(
+            redis_url,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        # Проверяем соединение
+        await self.redis.ping()
+    
+    async def disconnect(self):
+        """Закрыть соединение с Redis"""
+        if self.redis:
+            await self.redis.close()
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Получить значение из кеша"""
+        if self.redis:
+            return await self.redis.get(key)
+        return None
+    
+    async def set(self, key: str, value: str, expire: Optional[int] = None):
+        """Установить значение в кеш"""
+        if self.redis:
+            await self.redis.set(key, value, ex=expire)
+    
+    async def get_json(self, key: str) -> Optional[Any]:
+        """Получить JSON значение из кеша"""
+        value = await self.get(key)
+        if value:
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return None
+        return None
+    
+    async def set_json(self, key: str, value: Any, expire: Optional[int] = None):
+        """Установить JSON значение в кеш"""
+        await self.set(key, json.dumps(value, default=str), expire)
+    
+    async def write(self, set_json: Optional[dict] = None, delete: List[str] = (), incr: List[str] = (), expire: Optional[int] = None):
+        """Записать, удалить и увеличить ключи одним pipeline (один round trip)"""
+        if not self.redis:
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        for key, value in (set_json or {}).items():
+            pipe.set(key, json.dumps(value, default=str), ex=expire)
+        if delete:
+            pipe.delete(*delete)
+        for key in incr:
+            pipe.incr(key)
+        await pipe.execute()
+
+
+# Глобальный экземпляр Redis клиента
+redis_client = RedisClient()
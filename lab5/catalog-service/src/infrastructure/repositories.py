@@ -1,17 +1,60 @@
+from dataclasses import dataclass
 from typing import Optional, List
 from datetime import datetime
 from bson import ObjectId
-from pymongo.database import Database
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from ..domain.entities import Service, ServiceCategory
+from ..domain.entities import Service, ServiceCategory, ServiceSummary, ServiceBrowseResult, CategoryFacet, PriceBucket
 from ..repository.interfaces import ServiceRepository, ServiceCategoryRepository
-from .database import get_database
+from .database import get_database, bump_categories_version
+
+
+@dataclass
+class FindQuery:
+    """Форма запроса find: фильтр, проекция, сортировка и страница.
+    
+    Строится статическими методами *_query репозиториев; по ней же
+    index_advisor получает планы, поэтому отчет совпадает с запросами.
+    """
+    filter: dict
+    projection: Optional[dict] = None
+    sort: Optional[list] = None
+    skip: int = 0
+    limit: int = 0
+    
+    def cursor(self, collection):
+        """Курсор find по этой форме запроса"""
+        cursor = collection.find(self.filter, self.projection)
+        if self.sort:
+            cursor = cursor.sort(self.sort)
+        if self.skip:
+            cursor = cursor.skip(self.skip)
+        if self.limit:
+            cursor = cursor.limit(self.limit)
+        return cursor
+    
+    async def to_list(self, collection) -> list:
+        """Документы по этой форме запроса"""
+        return await self.cursor(collection).to_list(length=self.limit or None)
+
+
+def _browse_filter(category_id: Optional[str], min_price: Optional[float], max_price: Optional[float]) -> dict:
+    """Фильтр активных услуг каталога по категории и ценам"""
+    query = {"is_active": True}
+    if category_id:
+        query["category_id"] = category_id
+    if min_price is not None:
+        query["price_from"] = {"$gte": min_price}
+    if max_price is not None:
+        query["price_to"] = {"$lte": max_price}
+    return query
 
 
 class MongoServiceRepository(ServiceRepository):
     """MongoDB реализация репозитория услуг"""
     
-    def __init__(self, database: Database = None):
+    def __init__(self, database: AsyncIOMotorDatabase = None):
         self.database = database
         self.collection_name = "services"
     
@@ -21,19 +64,64 @@ class MongoServiceRepository(ServiceRepository):
             self.database = get_database()
         return self.database[self.collection_name]
     
-    async def get_all(self, limit: int = 100, offset: int = 0) -> List[Service]:
+    # Формы запросов
+    @staticmethod
+    def get_all_query(limit: int = 100, offset: int = 0) -> FindQuery:
+        # Порядок по _id: страницы стабильны и читаются по индексу _id, а не сканом коллекции
+        return FindQuery({}, ServiceSummary.PROJECTION, [("_id", 1)], offset, limit)
+    
+    @staticmethod
+    def get_by_id_query(service_id: str) -> FindQuery:
+        return FindQuery({"_id": ObjectId(service_id)}, limit=1)
+    
+    @staticmethod
+    def get_by_category_id_query(category_id: str, limit: int = 100, offset: int = 0) -> FindQuery:
+        return FindQuery({"category_id": category_id}, ServiceSummary.PROJECTION, [("_id", 1)], offset, limit)
+    
+    @staticmethod
+    def browse_query(
+        category_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> FindQuery:
+        # Начальные $match и $sort агрегации browse
+        return FindQuery(_browse_filter(category_id, min_price, max_price), sort=[("_id", 1)])
+    
+    @staticmethod
+    def count_by_category_query(min_price: Optional[float] = None, max_price: Optional[float] = None) -> FindQuery:
+        # Начальный $match агрегации count_by_category
+        return FindQuery(_browse_filter(None, min_price, max_price))
+    
+    @staticmethod
+    def search_by_name_query(name: str, limit: int = 50, offset: int = 0) -> FindQuery:
+        # Сортировка по релевантности, _id делает порядок страниц стабильным
+        return FindQuery(
+            {"$text": {"$search": name}},
+            {**ServiceSummary.PROJECTION, "score": {"$meta": "textScore"}},
+            [("score", {"$meta": "textScore"}), ("_id", 1)],
+            offset,
+            limit
+        )
+    
+    @staticmethod
+    def get_by_price_range_query(min_price: float, max_price: float) -> FindQuery:
+        return FindQuery({
+            "$and": [
+                {"price_from": {"$gte": min_price}},
+                {"price_to": {"$lte": max_price}},
+                {"is_active": True}
+            ]
+        }, ServiceSummary.PROJECTION)
+    
+    async def get_all(self, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
         """Получить все услуги с пагинацией"""
-        collection = self._get_collection()
-        cursor = collection.find({}).skip(offset).limit(limit)
-        services = []
-        for doc in cursor:
-            services.append(Service.from_dict(doc))
-        return services
+        docs = await self.get_all_query(limit, offset).to_list(self._get_collection())
+        return [ServiceSummary.from_dict(doc) for doc in docs]
     
     async def get_by_id(self, service_id: str) -> Optional[Service]:
         """Получить услугу по ID"""
         collection = self._get_collection()
-        doc = collection.find_one({"_id": ObjectId(service_id)})
+        doc = await collection.find_one(self.get_by_id_query(service_id).filter)
         if doc:
             return Service.from_dict(doc)
         return None
@@ -42,79 +130,137 @@ class MongoServiceRepository(ServiceRepository):
         """Создать услугу"""
         collection = self._get_collection()
         service_dict = service.to_dict()
-        result = collection.insert_one(service_dict)
+        result = await collection.insert_one(service_dict)
         
-        # Возвращаем созданный объект с ID
-        created_doc = collection.find_one({"_id": result.inserted_id})
-        return Service.from_dict(created_doc)
+        # Созданный объект собирается из вставленного документа, без повторного чтения
+        service_dict["_id"] = result.inserted_id
+        return Service.from_dict(service_dict)
     
     async def update(self, service: Service) -> Service:
         """Обновить услугу"""
         collection = self._get_collection()
         service_dict = service.to_dict()
         service_dict["updated_at"] = datetime.utcnow()
+        service_dict.pop("_id", None)
         
-        result = collection.update_one(
+        # Обновление и чтение результата за один запрос
+        updated_doc = await collection.find_one_and_update(
             {"_id": ObjectId(service.id)},
-            {"$set": service_dict}
+            {"$set": service_dict},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if updated_doc is None:
             raise ValueError(f"Service with id {service.id} not found")
         
-        # Возвращаем обновленный объект
-        updated_doc = collection.find_one({"_id": ObjectId(service.id)})
         return Service.from_dict(updated_doc)
     
     async def delete(self, service_id: str) -> bool:
         """Удалить услугу"""
         collection = self._get_collection()
-        result = collection.delete_one({"_id": ObjectId(service_id)})
+        result = await collection.delete_one({"_id": ObjectId(service_id)})
         return result.deleted_count > 0
     
-    async def get_by_category_id(self, category_id: str) -> List[Service]:
+    async def get_by_category_id(self, category_id: str, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
         """Получить услуги по ID категории"""
+        docs = await self.get_by_category_id_query(category_id, limit, offset).to_list(self._get_collection())
+        return [ServiceSummary.from_dict(doc) for doc in docs]
+    
+    async def browse(
+        self,
+        category_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ServiceBrowseResult:
+        """Страница услуг с ценовыми фасетами одной агрегацией $facet.
+        
+        Категория входит в общий $match, поэтому выборка идет по индексу
+        (category_id, _id), а без категории - по (is_active, price_from, price_to).
+        Сортировка по _id выполняется до $facet и не повторяется в каждом фасете.
+        """
         collection = self._get_collection()
-        cursor = collection.find({"category_id": category_id})
-        services = []
-        for doc in cursor:
-            services.append(Service.from_dict(doc))
-        return services
-    
-    async def search_by_name(self, name: str) -> List[Service]:
-        """Поиск услуг по названию (полнотекстовый поиск)"""
-        collection = self._get_collection()
-        cursor = collection.find(
-            {"$text": {"$search": name}},
-            {"score": {"$meta": "textScore"}}
-        ).sort([("score", {"$meta": "textScore"})]).limit(50)
+        query = self.browse_query(category_id, min_price, max_price)
         
-        services = []
-        for doc in cursor:
-            services.append(Service.from_dict(doc))
-        return services
+        pipeline = [
+            {"$match": query.filter},
+            {"$sort": dict(query.sort)},
+            {"$facet": {
+                "services": [
+                    {"$skip": offset},
+                    {"$limit": limit},
+                    {"$project": ServiceSummary.PROJECTION},
+                ],
+                "total": [{"$count": "count"}],
+                "price_buckets": [
+                    {"$match": {"price_from": {"$ne": None}}},
+                    {"$bucketAuto": {
+                        "groupBy": "$price_from",
+                        "buckets": ServiceBrowseResult.PRICE_BUCKETS,
+                        "output": {
+                            "count": {"$sum": 1},
+                            "min_price": {"$min": "$price_from"},
+                            "max_price": {"$max": "$price_from"},
+                        },
+                    }},
+                ],
+                "price_range": [
+                    {"$group": {"_id": None, "min_price": {"$min": "$price_from"}, "max_price": {"$max": "$price_to"}}},
+                ],
+            }},
+        ]
+        
+        # $bucketAuto и сортировка без подходящего индекса могут превысить лимит памяти 100 МБ
+        docs = await collection.aggregate(pipeline, allowDiskUse=True).to_list(length=1)
+        facets = docs[0]
+        price_range = facets["price_range"][0] if facets["price_range"] else {}
+        return ServiceBrowseResult(
+            services=[ServiceSummary.from_dict(doc) for doc in facets["services"]],
+            total=facets["total"][0]["count"] if facets["total"] else 0,
+            price_buckets=[
+                PriceBucket(min_price=doc["min_price"], max_price=doc["max_price"], count=doc["count"])
+                for doc in facets["price_buckets"]
+            ],
+            min_price=price_range.get("min_price"),
+            max_price=price_range.get("max_price"),
+        )
     
-    async def get_by_price_range(self, min_price: float, max_price: float) -> List[Service]:
-        """Получить услуги в диапазоне цен"""
+    async def count_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[CategoryFacet]:
+        """Количество активных услуг по категориям отдельной агрегацией по индексу цен"""
         collection = self._get_collection()
-        cursor = collection.find({
-            "$and": [
-                {"price_from": {"$gte": min_price}},
-                {"price_to": {"$lte": max_price}},
-                {"is_active": True}
-            ]
-        })
-        
-        services = []
-        for doc in cursor:
-            services.append(Service.from_dict(doc))
-        return services
+        pipeline = [
+            {"$match": self.count_by_category_query(min_price, max_price).filter},
+            {"$group": {"_id": "$category_id", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]
+        docs = await collection.aggregate(pipeline, allowDiskUse=True).to_list(length=None)
+        return [CategoryFacet(category_id=doc["_id"], count=doc["count"]) for doc in docs]
+    
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[ServiceSummary]:
+        """Поиск услуг по названию и описанию (полнотекстовый поиск по индексу services_text)"""
+        docs = await self.search_by_name_query(name, limit, offset).to_list(self._get_collection())
+        return [ServiceSummary.from_dict(doc) for doc in docs]
+    
+    async def count_by_name(self, name: str) -> int:
+        """Количество услуг, найденных полнотекстовым поиском"""
+        collection = self._get_collection()
+        return await collection.count_documents(self.search_by_name_query(name).filter)
+    
+    async def get_by_price_range(self, min_price: float, max_price: float) -> List[ServiceSummary]:
+        """Получить услуги в диапазоне цен"""
+        docs = await self.get_by_price_range_query(min_price, max_price).to_list(self._get_collection())
+        return [ServiceSummary.from_dict(doc) for doc in docs]
 
 
 class MongoServiceCategoryRepository(ServiceCategoryRepository):
     """MongoDB реализация репозитория категорий услуг"""
     
-    def __init__(self, database: Database = None):
+    def __init__(self, database: AsyncIOMotorDatabase = None):
         self.database = database
         self.collection_name = "categories"
     
@@ -124,19 +270,32 @@ class MongoServiceCategoryRepository(ServiceCategoryRepository):
             self.database = get_database()
         return self.database[self.collection_name]
     
+    # Формы запросов
+    @staticmethod
+    def get_all_query() -> FindQuery:
+        return FindQuery({"is_active": True})
+    
+    @staticmethod
+    def get_by_id_query(category_id: str) -> FindQuery:
+        return FindQuery({"_id": ObjectId(category_id)}, limit=1)
+    
+    @staticmethod
+    def get_by_name_query(name: str) -> FindQuery:
+        return FindQuery({"name": name}, limit=1)
+    
     async def get_all(self) -> List[ServiceCategory]:
         """Получить все активные категории"""
-        collection = self._get_collection()
-        cursor = collection.find({"is_active": True})
-        categories = []
-        for doc in cursor:
-            categories.append(ServiceCategory.from_dict(doc))
-        return categories
+        docs = await self.get_all_query().to_list(self._get_collection())
+        return [ServiceCategory.from_dict(doc) for doc in docs]
     
     async def get_by_id(self, category_id: str) -> Optional[ServiceCategory]:
         """Получить категорию по ID"""
+        # Некорректный ObjectId - такой категории нет (пока снимок не загружен,
+        # проверка категории услуги идет сюда и должна давать 400, а не ошибку bson)
+        if not ObjectId.is_valid(category_id):
+            return None
         collection = self._get_collection()
-        doc = collection.find_one({"_id": ObjectId(category_id)})
+        doc = await collection.find_one(self.get_by_id_query(category_id).filter)
         if doc:
             return ServiceCategory.from_dict(doc)
         return None
@@ -145,40 +304,47 @@ class MongoServiceCategoryRepository(ServiceCategoryRepository):
         """Создать категорию"""
         collection = self._get_collection()
         category_dict = category.to_dict()
-        result = collection.insert_one(category_dict)
+        result = await collection.insert_one(category_dict)
+        await bump_categories_version(self.database)
         
-        # Возвращаем созданный объект с ID
-        created_doc = collection.find_one({"_id": result.inserted_id})
-        return ServiceCategory.from_dict(created_doc)
+        # Созданный объект собирается из вставленного документа, без повторного чтения
+        category_dict["_id"] = result.inserted_id
+        return ServiceCategory.from_dict(category_dict)
     
     async def update(self, category: ServiceCategory) -> ServiceCategory:
         """Обновить категорию"""
         collection = self._get_collection()
         category_dict = category.to_dict()
         category_dict["updated_at"] = datetime.utcnow()
+        category_dict.pop("_id", None)
         
-        result = collection.update_one(
+        # Обновление и чтение результата за один запрос
+        updated_doc = await collection.find_one_and_update(
             {"_id": ObjectId(category.id)},
-            {"$set": category_dict}
+            {"$set": category_dict},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if updated_doc is None:
             raise ValueError(f"Category with id {category.id} not found")
         
-        # Возвращаем обновленный объект
-        updated_doc = collection.find_one({"_id": ObjectId(category.id)})
+        await bump_categories_version(self.database)
         return ServiceCategory.from_dict(updated_doc)
     
     async def delete(self, category_id: str) -> bool:
         """Удалить категорию"""
         collection = self._get_collection()
-        result = collection.delete_one({"_id": ObjectId(category_id)})
-        return result.deleted_count > 0
+        result = await collection.delete_one({"_id": ObjectId(category_id)})
+        if result.deleted_count == 0:
+            return False
+        
+        await bump_categories_version(self.database)
+        return True
     
     async def get_by_name(self, name: str) -> Optional[ServiceCategory]:
         """Получить категорию по названию"""
         collection = self._get_collection()
-        doc = collection.find_one({"name": name})
+        doc = await collection.find_one(self.get_by_name_query(name).filter)
         if doc:
             return ServiceCategory.from_dict(doc)
         return None 
\ No newline at end of file
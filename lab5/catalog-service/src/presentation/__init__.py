@@ -1,8 +1,10 @@
 from .models import (
     ServiceResponse, 
+    ServiceSummaryResponse,
     ServiceCreateRequest, 
     ServiceUpdateRequest,
     ServicesListResponse,
+    ServiceBrowseResponse,
     MessageResponse
 )
 from .controllers import router
@@ -10,9 +12,11 @@ from .dependencies import get_catalog_service
 
 __all__ = [
     "ServiceResponse", 
+    "ServiceSummaryResponse",
     "ServiceCreateRequest", 
     "ServiceUpdateRequest",
     "ServicesListResponse",
+    "ServiceBrowseResponse",
     "MessageResponse",
     "router",
     "get_catalog_service"
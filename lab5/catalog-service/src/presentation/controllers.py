@@ -3,9 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 
 from .models import (
     ServiceResponse, 
+    ServiceSummaryResponse,
     ServiceCreateRequest, 
     ServiceUpdateRequest,
     ServicesListResponse,
+    ServiceBrowseResponse,
     ServiceCategoryResponse,
     ServiceCategoryCreateRequest,
     CategoriesListResponse,
@@ -18,7 +20,8 @@ from .dependencies import (
 )
 from ..infrastructure.auth import AuthenticatedUser
 from ..use_cases.catalog_use_cases import CatalogService
-from ..domain.entities import Service, ServiceCategory
+from ..domain.entities import Service, ServiceCategory, ServiceSummary
+from ..domain.exceptions import CategoryNotFoundException
 
 router = APIRouter()
 
@@ -28,6 +31,11 @@ def create_service_response(service: Service) -> ServiceResponse:
     return ServiceResponse.from_domain(service)
 
 
+def create_service_summary_response(service: ServiceSummary) -> ServiceSummaryResponse:
+    """Создать response модель элемента списка услуг"""
+    return ServiceSummaryResponse.from_domain(service)
+
+
 def create_category_response(category: ServiceCategory) -> ServiceCategoryResponse:
     """Создать response модель для категории из доменной сущности"""
     return ServiceCategoryResponse.from_domain(category)
@@ -43,32 +51,56 @@ async def get_services(
 ):
     """Получить список услуг (требуется аутентификация)"""
     if category:
-        services = await catalog_service.get_services_by_category_id(category)
+        services = await catalog_service.get_services_by_category_id(category, limit=limit, offset=offset)
     else:
         services = await catalog_service.get_all_services(limit=limit, offset=offset)
     
     return ServicesListResponse(
-        services=[create_service_response(service) for service in services],
+        services=[create_service_summary_response(service) for service in services],
         total=len(services),
         limit=limit,
         offset=offset
     )
 
 
+@router.get("/services/browse", response_model=ServiceBrowseResponse, tags=["services"])
+async def browse_services(
+    category: Optional[str] = Query(None, description="Фильтр по категории"),
+    min_price: Optional[float] = Query(None, ge=0, description="Минимальная цена (price_from)"),
+    max_price: Optional[float] = Query(None, ge=0, description="Максимальная цена (price_to)"),
+    limit: int = Query(20, ge=1, le=100, description="Количество записей"),
+    offset: int = Query(0, ge=0, description="Смещение"),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    catalog_service: CatalogService = Depends(get_catalog_service)
+):
+    """Страница активных услуг с количеством по категориям и ценовыми интервалами (требуется аутентификация)"""
+    result = await catalog_service.browse_services(
+        category_id=category,
+        min_price=min_price,
+        max_price=max_price,
+        limit=limit,
+        offset=offset
+    )
+    return ServiceBrowseResponse.from_domain(result, limit, offset)
+
+
 @router.get("/services/search", response_model=ServicesListResponse, tags=["services"])
 async def search_services(
-    q: str = Query(..., description="Поисковый запрос"),
+    q: str = Query(..., min_length=1, description="Поисковый запрос"),
+    limit: int = Query(50, ge=1, le=100, description="Количество записей"),
+    offset: int = Query(0, ge=0, description="Смещение"),
     current_user: AuthenticatedUser = Depends(get_current_active_user),
     catalog_service: CatalogService = Depends(get_catalog_service)
 ):
-    """Поиск услуг по названию и описанию (требуется аутентификация)"""
-    services = await catalog_service.search_services_by_name(q)
+    """Поиск услуг по названию и описанию, по убыванию релевантности (требуется аутентификация)"""
+    services = await catalog_service.search_services_by_name(q, limit=limit, offset=offset)
+    total = await catalog_service.count_services_by_name(q)
     
     return ServicesListResponse(
-        services=[create_service_response(service) for service in services],
-        total=len(services),
-        limit=len(services),
-        offset=0
+        services=[create_service_summary_response(service) for service in services],
+        total=total,
+        limit=limit,
+        offset=offset
     )
 
 
@@ -100,13 +132,12 @@ async def create_service(
         service = service_request.to_domain()
         created_service = await catalog_service.create_service(service)
         return create_service_response(created_service)
+    except CategoryNotFoundException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid category_id: {service_request.category_id}. Use GET /api/v1/categories to see available categories."
+        )
     except Exception as e:
-        error_message = str(e)
-        if "ForeignKeyViolationError" in error_message and "category_id" in error_message:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid category_id: {service_request.category_id}. Use GET /api/v1/categories to see available categories."
-            )
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e)
@@ -135,6 +166,11 @@ async def update_service(
         
     except HTTPException:
         raise
+    except CategoryNotFoundException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid category_id: {service_request.category_id}. Use GET /api/v1/categories to see available categories."
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
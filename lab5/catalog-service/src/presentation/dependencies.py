@@ -4,9 +4,12 @@ from functools import lru_cache
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..infrastructure.repositories import MongoServiceRepository, MongoServiceCategoryRepository
+from ..infrastructure.cached_repositories import CachedServiceRepository
+from ..infrastructure.category_snapshot import SnapshotCategoryRepository, category_snapshot
+from ..infrastructure.redis_client import redis_client
 from ..infrastructure.database import get_database
 from ..infrastructure.auth import JWTService, JWTConfig, AuthenticatedUser, UserRole
 from ..use_cases.catalog_use_cases import CatalogService
@@ -19,11 +22,12 @@ _jwt_service = JWTService(_jwt_config)
 security = HTTPBearer()
 
 def get_catalog_service(
-    database: Database = Depends(get_database)
+    database: AsyncIOMotorDatabase = Depends(get_database)
 ) -> CatalogService:
-    """Получить экземпляр CatalogService с MongoDB репозиториями"""
-    service_repository = MongoServiceRepository(database)
-    category_repository = MongoServiceCategoryRepository(database)
+    """Получить экземпляр CatalogService с кеширующими MongoDB репозиториями"""
+    service_repository = CachedServiceRepository(MongoServiceRepository(database), redis_client)
+    # Категории читаются из снимка в памяти процесса
+    category_repository = SnapshotCategoryRepository(MongoServiceCategoryRepository(database), category_snapshot)
     return CatalogService(service_repository, category_repository)
 
 def get_jwt_service() -> JWTService:
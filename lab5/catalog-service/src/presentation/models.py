@@ -1,7 +1,7 @@
 from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
-from ..domain.entities import Service, ServiceCategory
+from ..domain.entities import Service, ServiceCategory, ServiceSummary, ServiceBrowseResult
 
 
 class ServiceCategoryResponse(BaseModel):
@@ -62,6 +62,30 @@ class ServiceResponse(BaseModel):
         )
 
 
+class ServiceSummaryResponse(BaseModel):
+    """Модель ответа для услуги в списках (без описания и дат)"""
+    id: str
+    category_id: str
+    name: str
+    price_from: Optional[float] = None
+    price_to: Optional[float] = None
+    duration_minutes: Optional[int] = None
+    is_active: bool
+
+    @classmethod
+    def from_domain(cls, service: ServiceSummary) -> "ServiceSummaryResponse":
+        """Создать response модель из краткого представления услуги"""
+        return cls(
+            id=service.id,
+            category_id=service.category_id,
+            name=service.name,
+            price_from=service.price_from,
+            price_to=service.price_to,
+            duration_minutes=service.duration_minutes,
+            is_active=service.is_active
+        )
+
+
 class ServiceCategoryCreateRequest(BaseModel):
     """Модель запроса для создания категории"""
     name: str = Field(..., min_length=1, max_length=100)
@@ -146,12 +170,58 @@ class ServiceCategoryUpdateRequest(BaseModel):
 
 class ServicesListResponse(BaseModel):
     """Модель ответа для списка услуг"""
-    services: List[ServiceResponse]
+    services: List[ServiceSummaryResponse]
     total: int
     limit: int
     offset: int
 
 
+class CategoryFacetResponse(BaseModel):
+    """Количество услуг категории в выдаче каталога"""
+    category_id: str
+    name: str
+    count: int
+
+
+class PriceBucketResponse(BaseModel):
+    """Ценовой интервал выдачи каталога"""
+    min_price: float
+    max_price: float
+    count: int
+
+
+class ServiceBrowseResponse(BaseModel):
+    """Модель ответа для страницы каталога с фасетами"""
+    services: List[ServiceSummaryResponse]
+    total: int
+    limit: int
+    offset: int
+    categories: List[CategoryFacetResponse]
+    price_buckets: List[PriceBucketResponse]
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+    @classmethod
+    def from_domain(cls, result: ServiceBrowseResult, limit: int, offset: int) -> "ServiceBrowseResponse":
+        """Создать response модель из результата просмотра каталога"""
+        return cls(
+            services=[ServiceSummaryResponse.from_domain(service) for service in result.services],
+            total=result.total,
+            limit=limit,
+            offset=offset,
+            categories=[
+                CategoryFacetResponse(category_id=facet.category_id, name=facet.name, count=facet.count)
+                for facet in result.categories
+            ],
+            price_buckets=[
+                PriceBucketResponse(min_price=bucket.min_price, max_price=bucket.max_price, count=bucket.count)
+                for bucket in result.price_buckets
+            ],
+            min_price=result.min_price,
+            max_price=result.max_price
+        )
+
+
 class CategoriesListResponse(BaseModel):
     """Модель ответа для списка категорий"""
     categories: List[ServiceCategoryResponse]
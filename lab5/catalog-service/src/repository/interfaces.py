@@ -1,14 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
-from ..domain.entities import Service, ServiceCategory
+from ..domain.entities import Service, ServiceCategory, ServiceSummary, ServiceBrowseResult, CategoryFacet
 
 
 class ServiceRepository(ABC):
     """Интерфейс репозитория для управления услугами"""
     
     @abstractmethod
-    async def get_all(self, limit: int = 100, offset: int = 0) -> List[Service]:
-        """Получить все услуги с пагинацией"""
+    async def get_all(self, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
+        """Получить все услуги с пагинацией (краткое представление)"""
         pass
     
     @abstractmethod
@@ -32,13 +32,39 @@ class ServiceRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_by_category_id(self, category_id: str) -> List[Service]:
-        """Получить услуги по ID категории"""
+    async def get_by_category_id(self, category_id: str, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
+        """Получить услуги по ID категории с пагинацией (краткое представление)"""
         pass
     
     @abstractmethod
-    async def search_by_name(self, name: str) -> List[Service]:
-        """Поиск услуг по названию"""
+    async def browse(
+        self,
+        category_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ServiceBrowseResult:
+        """Страница активных услуг по фильтру с ценовыми интервалами (без количества по категориям)"""
+        pass
+    
+    @abstractmethod
+    async def count_by_category(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[CategoryFacet]:
+        """Количество активных услуг по категориям для ценового фильтра, по убыванию"""
+        pass
+    
+    @abstractmethod
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[ServiceSummary]:
+        """Поиск услуг по названию и описанию по убыванию релевантности (краткое представление)"""
+        pass
+    
+    @abstractmethod
+    async def count_by_name(self, name: str) -> int:
+        """Количество услуг, найденных поиском по названию и описанию"""
         pass
 
 
@@ -68,4 +94,9 @@ class ServiceCategoryRepository(ABC):
     @abstractmethod
     async def delete(self, category_id: str) -> bool:
         """Удалить категорию"""
-        pass 
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def get_by_name(self, name: str) -> Optional[ServiceCategory]:
+        """Получить категорию по названию"""
+        pass
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from ..repository.interfaces import ServiceRepository, ServiceCategoryRepository
-from ..domain.entities import Service, ServiceCategory
+from ..domain.entities import Service, ServiceCategory, ServiceSummary, ServiceBrowseResult
+from ..domain.exceptions import CategoryNotFoundException, CategoryValidationError
 
 
 class CatalogService:
@@ -10,26 +11,53 @@ class CatalogService:
         self._category_repository = category_repository
     
     # Services
-    async def get_all_services(self, limit: int = 100, offset: int = 0) -> List[Service]:
+    async def get_all_services(self, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
         return await self._service_repository.get_all(limit, offset)
     
     async def get_service_by_id(self, service_id: str) -> Optional[Service]:
         return await self._service_repository.get_by_id(service_id)
     
     async def create_service(self, service: Service) -> Service:
+        await self._ensure_category_exists(service.category_id)
         return await self._service_repository.create(service)
     
     async def update_service(self, service: Service) -> Service:
+        await self._ensure_category_exists(service.category_id)
         return await self._service_repository.update(service)
     
+    async def _ensure_category_exists(self, category_id: str):
+        # Проверка обслуживается снимком категорий в памяти, без запроса к MongoDB
+        if await self._category_repository.get_by_id(category_id) is None:
+            raise CategoryNotFoundException(category_id)
+    
     async def delete_service(self, service_id: str) -> bool:
         return await self._service_repository.delete(service_id)
     
-    async def get_services_by_category_id(self, category_id: str) -> List[Service]:
-        return await self._service_repository.get_by_category_id(category_id)
+    async def get_services_by_category_id(self, category_id: str, limit: int = 100, offset: int = 0) -> List[ServiceSummary]:
+        return await self._service_repository.get_by_category_id(category_id, limit, offset)
+    
+    async def browse_services(
+        self,
+        category_id: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ServiceBrowseResult:
+        result = await self._service_repository.browse(category_id, min_price, max_price, limit, offset)
+        # Количество по категориям не зависит от выбранной категории и страницы - отдельный запрос
+        result.categories = await self._service_repository.count_by_category(min_price, max_price)
+        # Названия категорий берутся из снимка категорий в памяти, без запроса к MongoDB
+        names = {category.id: category.name for category in await self._category_repository.get_all()}
+        for facet in result.categories:
+            facet.name = names.get(facet.category_id, "")
+        return result
+    
+    async def search_services_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[ServiceSummary]:
+        return await self._service_repository.search_by_name(name, limit, offset)
     
-    async def search_services_by_name(self, name: str) -> List[Service]:
-        return await self._service_repository.search_by_name(name)
+    async def count_services_by_name(self, name: str) -> int:
+        return await self._service_repository.count_by_name(name)
     
     # Categories
     async def get_all_categories(self) -> List[ServiceCategory]:
@@ -39,6 +67,8 @@ class CatalogService:
         return await self._category_repository.get_by_id(category_id)
     
     async def create_category(self, category: ServiceCategory) -> ServiceCategory:
+        if await self._category_repository.get_by_name(category.name) is not None:
+            raise CategoryValidationError(f"Category with name '{category.name}' already exists")
         return await self._category_repository.create(category)
     
     async def update_category(self, category: ServiceCategory) -> ServiceCategory:
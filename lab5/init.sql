@@ -1,6 +1,7 @@
 -- Инициализация базы данных для Profi.ru
 -- Создание расширений
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Создание таблицы пользователей
 CREATE TABLE IF NOT EXISTS users (
@@ -20,6 +21,11 @@ CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
 CREATE INDEX IF NOT EXISTS idx_users_active ON users(is_active);
+-- Keyset-пагинация списка пользователей: ORDER BY created_at, id и (created_at, id) > курсор
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users(created_at, id);
+-- Поиск по маске имени: ILIKE '%...%' и similarity() через триграммы
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON users USING gin (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_full_name_trgm ON users USING gin (full_name gin_trgm_ops);
 
 -- Создание таблицы категорий услуг
 CREATE TABLE IF NOT EXISTS service_categories (
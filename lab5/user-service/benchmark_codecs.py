@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Скрипт для сравнения форматов сериализации кеша пользователей.
+Сравнивает прежний формат (словарь + isoformat + json) с кодеками CacheCodec
+по времени кодирования/декодирования и размеру значения.
+"""
+
+import sys
+import os
+import json
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+# Добавляем src в path для импорта модулей
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.domain.entities import User, UserRole
+from src.infrastructure.cache_codec import create_codec, user_to_record, record_to_user
+
+
+def make_user(i: int) -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=str(uuid4()),
+        username=f"testuser{i}",
+        email=f"testuser{i}@example.com",
+        full_name=f"Test User {i}",
+        hashed_password="$2b$12$" + "x" * 53,
+        role=UserRole.CLIENT,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def legacy_encode(users):
+    return [
+        json.dumps({
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "full_name": user.full_name,
+            "hashed_password": user.hashed_password,
+            "role": user.role.value,
+            "is_active": user.is_active,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+        }).encode("utf-8")
+        for user in users
+    ]
+
+
+def legacy_decode(values):
+    users = []
+    for value in values:
+        data = json.loads(value)
+        users.append(User(
+            id=data["id"],
+            username=data["username"],
+            email=data["email"],
+            full_name=data["full_name"],
+            hashed_password=data["hashed_password"],
+            role=UserRole(data["role"]),
+            is_active=data["is_active"],
+            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+            updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+        ))
+    return users
+
+
+def codec_functions(codec):
+    def encode(users):
+        return [codec.encode(user_to_record(user) + [time.time(), 0.01]) for user in users]
+
+    def decode(values):
+        return [record_to_user(codec.decode(value)) for value in values]
+
+    return encode, decode
+
+
+def measure(encode, decode, users, iterations):
+    values = encode(users)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode(users)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(values)
+    decode_time = time.perf_counter() - start
+
+    size = sum(len(value) for value in values)
+    return encode_time / iterations * 1e6, decode_time / iterations * 1e6, size
+
+
+def main(iterations: int = 2000):
+    variants = [("legacy-json", legacy_encode, legacy_decode)]
+    for name in ("json", "orjson", "msgpack"):
+        try:
+            variants.append((name, *codec_functions(create_codec(name))))
+        except ValueError:
+            print(f"Codec {name} is not installed, skipping")
+
+    for label, count in (("single user", 1), ("page of 50 users", 50)):
+        users = [make_user(i) for i in range(count)]
+        print(f"\n{label} ({iterations} iterations)")
+        print(f"{'format':<12} {'encode, us':>12} {'decode, us':>12} {'bytes':>8}")
+        for name, encode, decode in variants:
+            encode_us, decode_us, size = measure(encode, decode, users, iterations)
+            print(f"{name:<12} {encode_us:>12.1f} {decode_us:>12.1f} {size:>8}")
+
+
+if __name__ == "__main__":
+    iterations = 2000
+    if len(sys.argv) > 1:
+        try:
+            iterations = int(sys.argv[1])
+        except ValueError:
+            print("Usage: python benchmark_codecs.py [iterations]")
+            sys.exit(1)
+
+    main(iterations)
@@ -1,12 +1,13 @@
 import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-import bcrypt
 
 from src.presentation.controllers import router as user_router
-from src.infrastructure.database import get_async_session, create_tables
+from src.infrastructure.database import get_async_session, create_tables, get_pool_stats
 from src.infrastructure.repositories import SQLAlchemyUserRepository
 from src.infrastructure.redis_client import redis_client
+from src.infrastructure.local_cache import user_local_cache, USER_INVALIDATION_CHANNEL
+from src.infrastructure.password_hasher import password_hasher
 from src.domain.entities import UserRole
 
 # Создание приложения FastAPI
@@ -25,6 +26,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Фоновая задача, слушающая инвалидации L1 кеша пользователей
+l1_invalidation_task = None
+
 # Подключение роутеров
 app.include_router(user_router, prefix="/api/v1")
 
@@ -41,6 +45,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db-pool")
+async def db_pool_stats():
+    """Состояние пула соединений с БД в этом воркере (выдано, overflow, ожидания)"""
+    return get_pool_stats()
+
+
 async def create_admin_user():
     """Создать администратора при запуске приложения"""
     async for session in get_async_session():
@@ -56,7 +66,7 @@ async def create_admin_user():
             # Создаем администратора с захешированным паролем
             from src.domain.entities import User
             
-            hashed_password = bcrypt.hashpw("secret".encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            hashed_password = await password_hasher.hash("secret")
             
             admin_user = User(
                 username="admin",
@@ -88,6 +98,13 @@ async def startup_event():
     except Exception as e:
         print(f"Failed to connect to Redis: {e}")
     
+    # Запускаем подписку на инвалидации L1 кеша (L1 работает только при активной подписке)
+    global l1_invalidation_task
+    if redis_client.redis:
+        l1_invalidation_task = asyncio.create_task(
+            user_local_cache.listen_invalidations(redis_client, USER_INVALIDATION_CHANNEL)
+        )
+    
     # Создаем таблицы (на случай если не инициализированы через init.sql)
     try:
         await create_tables()
@@ -105,12 +122,19 @@ async def shutdown_event():
     """События при остановке приложения"""
     print("Shutting down User Service...")
     
+    # Останавливаем подписку на инвалидации L1 кеша
+    if l1_invalidation_task:
+        l1_invalidation_task.cancel()
+    
     # Отключаемся от Redis
     try:
         await redis_client.disconnect()
         print("Disconnected from Redis")
     except Exception as e:
         print(f"Error disconnecting from Redis: {e}")
+    
+    # Останавливаем пул потоков хеширования паролей
+    password_hasher.shutdown()
 
 
 if __name__ == "__main__":
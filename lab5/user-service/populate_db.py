@@ -2,85 +2,104 @@
 """
 Скрипт для заполнения базы данных тестовыми пользователями.
 Используется для тестирования производительности кеша.
+
+Пользователи загружаются пакетами через bulk_create (многострочный INSERT
+или COPY для больших пакетов). Источник - сгенерированные тестовые
+пользователи или файл CSV/NDJSON:
+
+    python populate_db.py 1000000
+    python populate_db.py --file users.ndjson --batch-size 5000 --warm-cache
 """
 
+import argparse
 import asyncio
 import sys
 import os
-import bcrypt
-from uuid import uuid4
+from typing import AsyncIterator
 
 # Добавляем src в path для импорта модулей
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.infrastructure.database import get_async_session, create_tables
-from src.infrastructure.repositories import SQLAlchemyUserRepository
-from src.domain.entities import User, UserRole
+from src.infrastructure.repositories import SQLAlchemyUserRepository, SQLAlchemyUserProfileRepository
+from src.infrastructure.cached_repositories import CachedUserRepository
+from src.infrastructure.redis_client import redis_client
+from src.infrastructure.user_import import read_file, parse_records
+from src.infrastructure.password_hasher import password_hasher
+from src.use_cases.user_use_cases import UserUseCases
+from src.domain.entities import UserRole
+
+
+async def generate_users(count: int) -> AsyncIterator[dict]:
+    """Тестовые пользователи testuser{i}"""
+    # Создаем хешированный пароль один раз для всех пользователей
+    hashed_password = await password_hasher.hash("testpass123")
 
+    for i in range(count):
+        yield {
+            "username": f"testuser{i}",
+            "email": f"testuser{i}@example.com",
+            "full_name": f"Test User {i}",
+            "hashed_password": hashed_password,
+            "role": UserRole.CLIENT.value,
+        }
 
-async def populate_users(count: int = 1000):
-    """Заполнить базу данных тестовыми пользователями"""
-    print(f"Populating database with {count} test users...")
-    
+
+async def populate_users(records: AsyncIterator[dict], batch_size: int, warm_cache: bool):
+    """Заполнить базу данных пользователями из потока записей"""
     # Создаем таблицы если их нет
     await create_tables()
-    
+
+    if warm_cache:
+        await redis_client.connect()
+
     async for session in get_async_session():
         try:
             user_repository = SQLAlchemyUserRepository(session)
-            
-            # Создаем хешированный пароль один раз для всех пользователей
-            hashed_password = bcrypt.hashpw("testpass123".encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-            
-            created_count = 0
-            for i in range(count):
-                try:
-                    user = User(
-                        username=f"testuser{i}",
-                        email=f"testuser{i}@example.com",
-                        full_name=f"Test User {i}",
-                        hashed_password=hashed_password,
-                        role=UserRole.CLIENT,
-                        is_active=True
-                    )
-                    
-                    # Проверяем, не существует ли уже такой пользователь
-                    existing_user = await user_repository.get_by_username(user.username)
-                    if existing_user:
-                        print(f"User {user.username} already exists, skipping...")
-                        continue
-                    
-                    created_user = await user_repository.create(user)
-                    created_count += 1
-                    
-                    if created_count % 100 == 0:
-                        print(f"Created {created_count} users...")
-                        
-                except Exception as e:
-                    print(f"Error creating user {i}: {e}")
-                    continue
-            
-            print(f"Successfully created {created_count} test users")
-            
+            if warm_cache:
+                user_repository = CachedUserRepository(user_repository, redis_client)
+            user_use_cases = UserUseCases(
+                user_repository, SQLAlchemyUserProfileRepository(session), password_hasher
+            )
+
+            result = await user_use_cases.import_users(records, batch_size=batch_size, warm_cache=warm_cache)
+
+            print(
+                f"Processed {result.received} records in {result.duration_seconds:.1f}s "
+                f"({result.rows_per_second:.0f} rows/s): created {result.created}, "
+                f"skipped {result.skipped} existing, rejected {result.rejected} invalid"
+            )
+
         except Exception as e:
             print(f"Database error: {e}")
             await session.rollback()
         finally:
             break  # Выходим из генератора после первой итерации
 
+    if warm_cache:
+        await redis_client.disconnect()
+
 
 async def main():
     """Главная функция"""
-    count = 1000
-    if len(sys.argv) > 1:
-        try:
-            count = int(sys.argv[1])
-        except ValueError:
-            print("Usage: python populate_db.py [count]")
-            sys.exit(1)
-    
-    await populate_users(count)
+    parser = argparse.ArgumentParser(description="Populate the users table")
+    parser.add_argument("count", nargs="?", type=int, default=1000, help="number of test users to generate")
+    parser.add_argument("--file", help="CSV or NDJSON file to import instead of generated users")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="file format (by default - from extension)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--warm-cache", action="store_true", help="put created users into Redis")
+    args = parser.parse_args()
+
+    if args.file:
+        data_format = args.format or ("csv" if args.file.endswith(".csv") else "ndjson")
+        print(f"Importing users from {args.file} ({data_format})...")
+        records = parse_records(read_file(args.file), data_format)
+    else:
+        print(f"Populating database with {args.count} test users...")
+        records = generate_users(args.count)
+
+    await populate_users(records, args.batch_size, args.warm_cache)
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
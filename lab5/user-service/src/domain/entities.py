@@ -1,3 +1,4 @@
+import base64
 from typing import Optional, List
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -10,6 +11,30 @@ class UserRole(str, Enum):
     SPECIALIST = "specialist"
 
 
+@dataclass(frozen=True)
+class UserCursor:
+    """Позиция в списке пользователей, упорядоченном по (created_at, id)"""
+    created_at: datetime
+    id: str
+    
+    @classmethod
+    def after(cls, user: "User") -> "UserCursor":
+        """Позиция сразу после пользователя"""
+        return cls(created_at=user.created_at, id=user.id)
+    
+    def encode(self) -> str:
+        """Непрозрачный токен курсора для API"""
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    
+    @classmethod
+    def decode(cls, token: str) -> "UserCursor":
+        """Разобрать токен курсора (ValueError для некорректного токена)"""
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("utf-8")
+        created_at, user_id = raw.split("|", 1)
+        return cls(created_at=datetime.fromisoformat(created_at), id=user_id)
+
+
 @dataclass
 class User:
     """Доменная сущность пользователя"""
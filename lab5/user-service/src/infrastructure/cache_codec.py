@@ -0,0 +1,172 @@
+import os
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone, timedelta
+from typing import Any, Optional, List
+
+from ..domain.entities import User, UserProfile, UserRole
+
+try:
+    import msgpack
+except ImportError:  # msgpack - опциональная зависимость
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # orjson - опциональная зависимость
+    orjson = None
+
+
+class CacheCodec(ABC):
+    """Кодек значений кеша: одно кодирование/декодирование на запись"""
+    
+    name: str = ""
+    
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Закодировать значение"""
+        pass
+    
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Раскодировать значение"""
+        pass
+
+
+class JsonCodec(CacheCodec):
+    """Кодек на стандартном json"""
+    
+    name = "json"
+    
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+    
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(CacheCodec):
+    """Кодек на orjson"""
+    
+    name = "orjson"
+    
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+    
+    def decode(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(CacheCodec):
+    """Кодек на msgpack"""
+    
+    name = "msgpack"
+    
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+    
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+def create_codec(name: Optional[str] = None) -> CacheCodec:
+    """Создать кодек по имени (msgpack, orjson, json).
+    
+    По умолчанию имя берется из USER_CACHE_CODEC, а если кодек не задан,
+    выбирается самый быстрый из установленных.
+    """
+    name = name or os.getenv("USER_CACHE_CODEC")
+    if name is None:
+        name = "msgpack" if msgpack else "orjson" if orjson else "json"
+    
+    if name == "msgpack" and msgpack:
+        return MsgpackCodec()
+    if name == "orjson" and orjson:
+        return OrjsonCodec()
+    if name == "json":
+        return JsonCodec()
+    raise ValueError(f"Cache codec '{name}' is not available")
+
+
+# Записи сущностей - списки полей в фиксированном порядке,
+# даты хранятся как unix timestamp (UTC) без строкового представления.
+# Наивная дата (колонки TIMESTAMP, datetime.utcnow()) хранится числом и
+# читается обратно наивной; дата с часовым поясом - парой [timestamp, смещение].
+
+def _to_timestamp(value: Optional[datetime]) -> Optional[Any]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc).timestamp()
+    return [value.timestamp(), value.utcoffset().total_seconds()]
+
+
+def _from_timestamp(value: Optional[Any]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        timestamp, offset = value
+        return datetime.fromtimestamp(timestamp, timezone(timedelta(seconds=offset)))
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+def user_to_record(user: User) -> List[Any]:
+    """Преобразование User в запись для кеширования"""
+    return [
+        user.id,
+        user.username,
+        user.email,
+        user.full_name,
+        user.hashed_password,
+        user.role.value,
+        user.is_active,
+        _to_timestamp(user.created_at),
+        _to_timestamp(user.updated_at),
+    ]
+
+
+def record_to_user(record: List[Any]) -> User:
+    """Преобразование записи кеша в User"""
+    return User(
+        id=record[0],
+        username=record[1],
+        email=record[2],
+        full_name=record[3],
+        hashed_password=record[4],
+        role=UserRole(record[5]),
+        is_active=record[6],
+        created_at=_from_timestamp(record[7]),
+        updated_at=_from_timestamp(record[8]),
+    )
+
+
+# Количество полей пользователя в записи; следом могут идти служебные поля
+USER_RECORD_SIZE = 9
+
+
+def profile_to_record(profile: UserProfile) -> List[Any]:
+    """Преобразование UserProfile в запись для кеширования"""
+    return [
+        profile.user_id,
+        profile.phone,
+        profile.address,
+        profile.bio,
+        profile.avatar_url,
+        list(profile.skills),
+        profile.rating,
+        profile.reviews_count,
+    ]
+
+
+def record_to_profile(record: List[Any]) -> UserProfile:
+    """Преобразование записи кеша в UserProfile"""
+    return UserProfile(
+        user_id=record[0],
+        phone=record[1],
+        address=record[2],
+        bio=record[3],
+        avatar_url=record[4],
+        skills=record[5],
+        rating=record[6],
+        reviews_count=record[7],
+    )
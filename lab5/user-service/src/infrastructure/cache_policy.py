@@ -0,0 +1,46 @@
+import os
+import math
+import time
+import random
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheTTLPolicy:
+    """Политика времени жизни записей кеша.
+    
+    soft_ttl - срок, после которого запись считается устаревшей и обновляется
+    в фоне (stale-while-revalidate); hard_ttl - TTL ключа в Redis, до истечения
+    которого устаревшая запись еще может быть отдана. Оба срока размываются
+    джиттером, чтобы записи, созданные одновременно, не истекали одной волной.
+    """
+    soft_ttl: float
+    hard_ttl: int
+    jitter: float = 0.1
+    beta: float = 1.0  # агрессивность вероятностного раннего обновления
+    
+    @classmethod
+    def from_env(cls, prefix: str, soft_ttl: float, hard_ttl: int) -> "CacheTTLPolicy":
+        """Создать политику из переменных окружения {prefix}_SOFT_TTL, {prefix}_HARD_TTL и т.д."""
+        return cls(
+            soft_ttl=float(os.getenv(f"{prefix}_SOFT_TTL", soft_ttl)),
+            hard_ttl=int(os.getenv(f"{prefix}_HARD_TTL", hard_ttl)),
+            jitter=float(os.getenv(f"{prefix}_TTL_JITTER", "0.1")),
+            beta=float(os.getenv(f"{prefix}_EARLY_REFRESH_BETA", "1.0")),
+        )
+    
+    def expire(self) -> int:
+        """TTL ключа в Redis с джиттером"""
+        return max(1, int(self.hard_ttl * (1 + random.uniform(0, self.jitter))))
+    
+    def soft_expiry(self) -> float:
+        """Момент (unix time), после которого запись считается устаревшей"""
+        return time.time() + self.soft_ttl * (1 - random.uniform(0, self.jitter))
+    
+    def should_refresh(self, soft_expiry: float, delta: float) -> bool:
+        """Нужно ли обновить запись (вероятностное раннее истечение, XFetch).
+        
+        delta - время, за которое значение было получено из БД: чем дороже
+        загрузка, тем раньше до soft_expiry запускается обновление.
+        """
+        return time.time() - delta * self.beta * math.log(1.0 - random.random()) >= soft_expiry
@@ -1,289 +1,659 @@
-from typing import Optional, List
-from ..domain.entities import User, UserProfile
+import os
+import time
+import asyncio
+from typing import Optional, List, Tuple, Union, Callable, Awaitable, AsyncContextManager, Set
+from dataclasses import replace
+from ..domain.entities import User, UserProfile, UserCursor
 from ..repository.interfaces import UserRepository, UserProfileRepository
-from .redis_client import RedisClient
+from .redis_client import RedisClient, RedisBatch
+from .local_cache import LocalCache, USER_INVALIDATION_CHANNEL
+from .single_flight import SingleFlight
+from .response_cache import ResponseCache
+from .cache_policy import CacheTTLPolicy
+from .cache_codec import (
+    CacheCodec, create_codec, user_to_record, record_to_user, USER_RECORD_SIZE,
+    profile_to_record, record_to_profile
+)
 from .repositories import SQLAlchemyUserRepository, SQLAlchemyUserProfileRepository
 
+# Значение-надгробие: пользователь заведомо отсутствует в БД (отрицательный кеш)
+NEGATIVE_CACHE_MARKER = "-"
+NEGATIVE_CACHE_MARKER_BYTES = NEGATIVE_CACHE_MARKER.encode("utf-8")
+
+# Признак попадания в отрицательный кеш (в отличие от None - промаха кеша)
+ABSENT = object()
+
+# Ссылки на фоновые задачи обновления кеша, чтобы их не собрал GC
+_background_tasks: Set[asyncio.Task] = set()
+
 
 class CachedUserRepository(UserRepository):
-    """Кеширующий репозиторий пользователей с паттернами read-through и write-through"""
+    """Кеширующий репозиторий пользователей с паттернами read-through и write-through.
+    
+    Раскладка кеша нормализована: тело пользователя хранится один раз под
+    user:id:{id}, ключи user:username:{username} и user:email:{email} содержат
+    только id, а страницы списков и поиска - массивы id, которые разрешаются
+    через MGET.
+    
+    Перед Redis может стоять in-process L1 кеш тел пользователей по id;
+    при записи id публикуется в канал инвалидации для остальных воркеров.
+    
+    Одновременные промахи по одному ключу объединяются (single-flight) внутри
+    воркера и, если задан USER_CACHE_MISS_LOCK_MS, короткой блокировкой
+    в Redis между воркерами.
+    
+    Отсутствующие пользователи и пустые страницы кешируются на короткий
+    negative_cache_ttl; надгробия перезаписываются при создании пользователя.
     
-    def __init__(self, db_repository: SQLAlchemyUserRepository, redis_client: RedisClient):
+    Тела пользователей и страницы хранят мягкий срок годности (_soft_exp) и
+    время загрузки (_delta). Устаревшая запись отдается, пока одна фоновая
+    задача обновляет ее через repository_factory (stale-while-revalidate);
+    без фабрики истекшая по мягкому сроку запись считается промахом.
+    
+    Значения кодируются CacheCodec (msgpack/orjson/json) одной операцией на
+    запись: пользователь - список полей в фиксированном порядке с датами в виде
+    unix timestamp, за которыми следуют мягкий срок и время загрузки.
+    
+    Если задан response_cache, любая запись сбрасывает и готовые HTTP ответы.
+    """
+    
+    def __init__(
+        self,
+        db_repository: SQLAlchemyUserRepository,
+        redis_client: RedisClient,
+        local_cache: Optional[LocalCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        repository_factory: Optional[Callable[[], AsyncContextManager[SQLAlchemyUserRepository]]] = None,
+        user_ttl_policy: Optional[CacheTTLPolicy] = None,
+        page_ttl_policy: Optional[CacheTTLPolicy] = None,
+        codec: Optional[CacheCodec] = None,
+        response_cache: Optional[ResponseCache] = None
+    ):
         self.db_repository = db_repository
         self.redis_client = redis_client
-        self.cache_ttl = 3600  # TTL для кеша - 1 час
+        self.local_cache = local_cache
+        self.response_cache = response_cache
+        self.single_flight = single_flight or SingleFlight()
+        self.repository_factory = repository_factory  # репозиторий с собственной сессией для фоновых обновлений
+        # Тела пользователей: мягкий срок 50 минут, в Redis - 1 час
+        self.user_ttl_policy = user_ttl_policy or CacheTTLPolicy.from_env("USER_CACHE", 3000, 3600)
+        # Страницы списков и поиска: устаревшие поколения истекают сами
+        self.page_ttl_policy = page_ttl_policy or CacheTTLPolicy.from_env("USER_LIST_CACHE", 300, 600)
+        self.negative_cache_ttl = 60  # TTL для надгробий и пустых страниц
+        self.count_ttl = 3600  # точный счетчик поддерживается записями, TTL ограничивает дрейф
+        self.count_estimate_ttl = 60  # оценка reltuples дешевая, но меняется только после ANALYZE
+        self.codec = codec or create_codec()
+        self.miss_lock_ttl_ms = int(os.getenv("USER_CACHE_MISS_LOCK_MS", "0"))  # 0 - без блокировки между воркерами
+        self.miss_lock_poll_interval = 0.02
     
     def _get_user_cache_key(self, identifier: str, field: str = "id") -> str:
         """Генерация ключа кеша для пользователя"""
         return f"user:{field}:{identifier}"
     
-    def _get_users_list_cache_key(self, limit: int, offset: int) -> str:
+    def _get_generation_key(self, namespace: str) -> str:
+        """Ключ счетчика поколения для пространства имен (list/search)"""
+        return f"users:{namespace}:gen"
+    
+    async def _get_generation(self, namespace: str) -> str:
+        """Текущее поколение пространства имен списков или поиска"""
+        generation = await self.redis_client.get(self._get_generation_key(namespace))
+        return generation or "0"
+    
+    def _get_users_list_cache_key(self, generation: str, limit: int, offset: int) -> str:
         """Генерация ключа кеша для списка пользователей"""
-        return f"users:list:{limit}:{offset}"
-    
-    def _get_search_cache_key(self, name: str) -> str:
-        """Генерация ключа кеша для поиска"""
-        return f"users:search:{name}"
-    
-    async def _user_to_dict(self, user: User) -> dict:
-        """Преобразование User в словарь для кеширования"""
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "full_name": user.full_name,
-            "hashed_password": user.hashed_password,
-            "role": user.role.value,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None,
-        }
-    
-    async def _dict_to_user(self, data: dict) -> User:
-        """Преобразование словаря в User"""
-        from datetime import datetime
-        from ..domain.entities import UserRole
-        
-        return User(
-            id=data["id"],
-            username=data["username"],
-            email=data["email"],
-            full_name=data["full_name"],
-            hashed_password=data["hashed_password"],
-            role=UserRole(data["role"]),
-            is_active=data["is_active"],
-            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
-        )
+        return f"users:list:{generation}:{limit}:{offset}"
+    
+    def _get_users_page_cache_key(self, generation: str, limit: int, after: Optional[UserCursor]) -> str:
+        """Генерация ключа кеша для страницы списка после курсора (не зависит от глубины страницы)"""
+        position = f"{after.created_at.isoformat()}/{after.id}" if after else "start"
+        return f"users:list:{generation}:{limit}:after:{position}"
+    
+    def _get_count_cache_key(self, estimate: bool = False) -> str:
+        """Ключ кеша количества пользователей"""
+        return "users:count:estimate" if estimate else "users:count"
+    
+    def _get_search_cache_key(self, generation: str, name: str, limit: int, offset: int) -> str:
+        """Генерация ключа кеша для страницы поиска"""
+        return f"users:search:{generation}:{limit}:{offset}:{name}"
+    
+    def _get_search_count_cache_key(self, generation: str, name: str) -> str:
+        """Генерация ключа кеша для количества результатов поиска"""
+        return f"users:search:{generation}:count:{name}"
+    
+    def _decode(self, data: bytes) -> Optional[list]:
+        """Раскодировать значение кеша; значение чужого формата считается промахом"""
+        try:
+            return self.codec.decode(data)
+        except Exception:
+            return None
+    
+    def _get_user_cache_keys(self, user: User) -> List[str]:
+        """Все ключи, под которыми кешируется пользователь"""
+        return [
+            self._get_user_cache_key(user.id, "id"),
+            self._get_user_cache_key(user.username, "username"),
+            self._get_user_cache_key(user.email, "email"),
+        ]
+    
+    def _add_user_to_batch(self, batch: RedisBatch, user: User, delta: float = 0.0):
+        """Добавить в batch тело пользователя и указатели username/email -> id"""
+        record = user_to_record(user)
+        record.append(self.user_ttl_policy.soft_expiry())
+        record.append(delta)
+        expire = self.user_ttl_policy.expire()
+        
+        batch.set(self._get_user_cache_key(user.id, "id"), self.codec.encode(record), expire)
+        batch.set(self._get_user_cache_key(user.username, "username"), user.id, expire)
+        batch.set(self._get_user_cache_key(user.email, "email"), user.id, expire)
+    
+    def _user_from_record(self, record: Optional[list]) -> Optional[User]:
+        """Пользователь из записи кеша: поля, мягкий срок, время загрузки (None для записи неверного формата)"""
+        if not isinstance(record, list) or len(record) != USER_RECORD_SIZE + 2:
+            return None
+        return record_to_user(record)
+    
+    async def _cache_user(self, user: User, delta: float = 0.0):
+        """Кеширование пользователя за один round trip"""
+        batch = self.redis_client.batch()
+        self._add_user_to_batch(batch, user, delta)
+        await batch.execute()
+        self._set_local(user)
+    
+    def _is_fresh(
+        self,
+        cache_key: str,
+        soft_expiry: Optional[float],
+        delta: float,
+        policy: CacheTTLPolicy,
+        refresh: Optional[Callable[[SQLAlchemyUserRepository], Awaitable]]
+    ) -> bool:
+        """Проверить срок годности записи и при необходимости запустить фоновое обновление.
+        
+        Возвращает False, только если запись истекла по мягкому сроку,
+        а обновить ее в фоне нельзя - тогда вызывающий считает это промахом.
+        """
+        if soft_expiry is None or not policy.should_refresh(soft_expiry, delta):
+            return True
+        
+        if refresh is not None and self._schedule_refresh(cache_key, refresh):
+            return True
+        
+        return time.time() < soft_expiry
+    
+    def _schedule_refresh(
+        self,
+        cache_key: str,
+        refresh: Callable[[SQLAlchemyUserRepository], Awaitable]
+    ) -> bool:
+        """Запустить одно фоновое обновление записи на воркер"""
+        if self.repository_factory is None:
+            return False
+        
+        flight_key = f"refresh:{cache_key}"
+        if self.single_flight.is_loading(flight_key):
+            return True
+        
+        async def run():
+            async with self.repository_factory() as repository:
+                await refresh(repository)
+        
+        async def run_logged():
+            try:
+                await self.single_flight.do(flight_key, run)
+            except Exception as e:
+                print(f"Background cache refresh failed for {cache_key}: {e}")
+        
+        task = asyncio.create_task(run_logged())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return True
+    
+    def _get_local(self, user_id: str) -> Optional[User]:
+        """Получить копию пользователя из L1 кеша"""
+        if self.local_cache is None:
+            return None
+        user = self.local_cache.get(user_id)
+        # Возвращаем копию: use cases изменяют полученные сущности
+        return replace(user) if user else None
+    
+    def _set_local(self, user: User):
+        """Сохранить копию пользователя в L1 кеш"""
+        if self.local_cache is not None:
+            self.local_cache.set(user.id, replace(user))
     
-    async def _cache_user(self, user: User):
-        """Кеширование пользователя по всем ключам"""
-        user_dict = await self._user_to_dict(user)
+    def _publish_invalidation(self, batch: RedisBatch, user_id: str):
+        """Удалить пользователя из локального L1, оповестить остальные воркеры и сбросить готовые ответы"""
+        if self.local_cache is not None:
+            self.local_cache.delete(user_id)
+        batch.publish(USER_INVALIDATION_CHANNEL, user_id)
+        if self.response_cache is not None:
+            self.response_cache.add_invalidation(batch, user_id)
+    
+    async def _get_cached_body(self, user_id: str):
+        """Получить пользователя по id из L1, затем из Redis.
         
-        # Кешируем по ID, username и email
-        await self.redis_client.set_json(
-            self._get_user_cache_key(user.id, "id"), 
-            user_dict, 
-            self.cache_ttl
-        )
-        await self.redis_client.set_json(
-            self._get_user_cache_key(user.username, "username"), 
-            user_dict, 
-            self.cache_ttl
-        )
-        await self.redis_client.set_json(
-            self._get_user_cache_key(user.email, "email"), 
-            user_dict, 
-            self.cache_ttl
+        Возвращает User, ABSENT для надгробия или None при промахе.
+        """
+        user = self._get_local(user_id)
+        if user:
+            return user
+        
+        cache_key = self._get_user_cache_key(user_id, "id")
+        cached_value = await self.redis_client.get_bytes(cache_key)
+        if cached_value == NEGATIVE_CACHE_MARKER_BYTES:
+            return ABSENT
+        if not cached_value:
+            return None
+        
+        record = self._decode(cached_value)
+        user = self._user_from_record(record)
+        if user is None:
+            return None
+        
+        soft_expiry, delta = record[USER_RECORD_SIZE:]
+        refresh = lambda repository: self._load_user(cache_key, lambda: repository.get_by_id(user_id))
+        if not self._is_fresh(cache_key, soft_expiry, delta, self.user_ttl_policy, refresh):
+            return None
+        
+        self._set_local(user)
+        return user
+    
+    async def _cache_users_page(self, cache_key: str, users: List[User], delta: float = 0.0):
+        """Кеширование страницы (массив id) вместе с телами пользователей"""
+        batch = self.redis_client.batch(transaction=False)
+        for user in users:
+            self._add_user_to_batch(batch, user, delta)
+        # Страница - [ids, мягкий срок, время загрузки]
+        batch.set(
+            cache_key,
+            self.codec.encode([[user.id for user in users], self.page_ttl_policy.soft_expiry(), delta]),
+            self.page_ttl_policy.expire()
         )
+        await batch.execute()
     
-    async def _invalidate_user_cache(self, user: User):
-        """Инвалидация кеша пользователя"""
-        await self.redis_client.delete(self._get_user_cache_key(user.id, "id"))
-        await self.redis_client.delete(self._get_user_cache_key(user.username, "username"))
-        await self.redis_client.delete(self._get_user_cache_key(user.email, "email"))
+    async def _get_cached_page(
+        self,
+        cache_key: str,
+        refresh: Optional[Callable[[SQLAlchemyUserRepository], Awaitable]] = None
+    ) -> Optional[List[User]]:
+        """Получить страницу из кеша.
+        
+        Возвращает None, если нет самой страницы или хотя бы одного
+        из пользователей, на которых она ссылается.
+        """
+        cached_value = await self.redis_client.get_bytes(cache_key)
+        if not cached_value:
+            return None
+        
+        page = self._decode(cached_value)
+        if not isinstance(page, list) or len(page) != 3:
+            return None
+        
+        user_ids, soft_expiry, delta = page
+        if not self._is_fresh(cache_key, soft_expiry, delta, self.page_ttl_policy, refresh):
+            return None
+        if not user_ids:
+            return []
+        
+        users = []
+        for value in await self.redis_client.get_many_bytes(
+            [self._get_user_cache_key(user_id, "id") for user_id in user_ids]
+        ):
+            user = self._user_from_record(self._decode(value)) if value else None
+            if user is None:
+                return None
+            users.append(user)
         
-        # Также инвалидируем списки и поиск
-        await self.redis_client.clear_pattern("users:list:*")
-        await self.redis_client.clear_pattern("users:search:*")
+        return users
+    
+    async def _get_by_pointer(self, field: str, value: str):
+        """Получить пользователя из кеша по указателю username/email -> id.
+        
+        Возвращает User, ABSENT для надгробия или None при промахе.
+        """
+        user_id = await self.redis_client.get(self._get_user_cache_key(value, field))
+        if user_id == NEGATIVE_CACHE_MARKER:
+            return ABSENT
+        if not user_id:
+            return None
+        
+        user = await self._get_cached_body(user_id)
+        # Указатель мог устареть после смены username/email - сверяем с телом
+        if isinstance(user, User) and getattr(user, field) == value:
+            return user
+        return None
+    
+    async def _get_cached_count(self, cache_key: str, load: Callable[[], Awaitable[int]], ttl: int) -> int:
+        """Получить счетчик из кеша или загрузить его, объединяя одновременные промахи"""
+        cached_value = await self.redis_client.get(cache_key)
+        if cached_value is not None:
+            return int(cached_value)
+        
+        async def loader() -> int:
+            value = await load()
+            await self.redis_client.set(cache_key, str(value), ttl)
+            return value
+        
+        return await self.single_flight.do(cache_key, loader)
+    
+    def _clone(self, result: Union[None, User, List[User]]) -> Union[None, User, List[User]]:
+        """Копия результата для каждого из объединенных вызовов"""
+        if result is None or result is ABSENT:
+            return None
+        if isinstance(result, list):
+            return [replace(user) for user in result]
+        return replace(result)
+    
+    async def _load_coalesced(
+        self,
+        cache_key: str,
+        read_cache: Callable[[], Awaitable],
+        load: Callable[[], Awaitable]
+    ):
+        """Загрузить данные при промахе кеша, объединяя одновременные промахи.
+        
+        load читает БД и кеширует результат, read_cache повторно проверяет кеш
+        пока другой воркер держит блокировку загрузки.
+        """
+        async def loader():
+            if self.miss_lock_ttl_ms > 0:
+                return await self._load_with_lock(cache_key, read_cache, load)
+            return await load()
+        
+        return self._clone(await self.single_flight.do(cache_key, loader))
+    
+    async def _load_with_lock(
+        self,
+        cache_key: str,
+        read_cache: Callable[[], Awaitable],
+        load: Callable[[], Awaitable]
+    ):
+        """Загрузка под короткой блокировкой в Redis"""
+        lock_key = f"lock:{cache_key}"
+        if await self.redis_client.acquire_lock(lock_key, self.miss_lock_ttl_ms):
+            try:
+                return await load()
+            finally:
+                await self.redis_client.delete(lock_key)
+        
+        # Другой воркер уже загружает эти данные - ждем, пока он заполнит кеш
+        deadline = time.monotonic() + self.miss_lock_ttl_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.miss_lock_poll_interval)
+            cached = await read_cache()
+            if cached is not None:
+                return cached
+        
+        return await load()
+    
+    async def _load_user(
+        self,
+        lookup_key: str,
+        load: Callable[[], Awaitable[Optional[User]]]
+    ) -> Optional[User]:
+        """Загрузить пользователя из БД и закешировать.
+        
+        Если пользователя нет, под ключом поиска сохраняется надгробие.
+        """
+        started = time.monotonic()
+        user = await load()
+        if user:
+            await self._cache_user(user, time.monotonic() - started)
+        else:
+            await self.redis_client.set(lookup_key, NEGATIVE_CACHE_MARKER, self.negative_cache_ttl)
+        return user
+    
+    async def _load_page(self, cache_key: str, load: Callable[[], Awaitable[List[User]]]) -> List[User]:
+        """Загрузить страницу из БД и закешировать (пустую - на короткий срок)"""
+        started = time.monotonic()
+        users = await load()
+        if users:
+            await self._cache_users_page(cache_key, users, time.monotonic() - started)
+        else:
+            await self.redis_client.set(cache_key, self.codec.encode([[], None, 0.0]), self.negative_cache_ttl)
+        return users
     
     async def create(self, user: User) -> User:
         """Создать пользователя (write-through)"""
         # Сначала записываем в БД
         created_user = await self.db_repository.create(user)
         
-        # Затем кешируем результат
-        await self._cache_user(created_user)
-        
-        # Инвалидируем списки и поиски
-        await self.redis_client.clear_pattern("users:list:*")
-        await self.redis_client.clear_pattern("users:search:*")
+        # Затем кешируем результат и инвалидируем списки и поиски одной транзакцией
+        batch = self.redis_client.batch()
+        self._add_user_to_batch(batch, created_user)
+        self._publish_invalidation(batch, created_user.id)
+        batch.incr(self._get_generation_key("list"))
+        batch.incr(self._get_generation_key("search"))
+        batch.incr_existing(self._get_count_cache_key())
+        await batch.execute()
         
         return created_user
     
+    async def bulk_create(self, users: List[User], warm_cache: bool = False) -> List[User]:
+        """Создать пользователей пакетом (write-through).
+        
+        Списки, поиск и счетчик инвалидируются один раз на пакет. Ключи новых
+        пользователей перезаписываются (warm_cache) или удаляются, чтобы не
+        остались надгробия от прежних промахов.
+        """
+        created_users = await self.db_repository.bulk_create(users)
+        if not created_users:
+            return created_users
+        
+        batch = self.redis_client.batch(transaction=False)
+        for user in created_users:
+            if warm_cache:
+                self._add_user_to_batch(batch, user)
+            else:
+                batch.delete(*self._get_user_cache_keys(user))
+        batch.incr(self._get_generation_key("list"))
+        batch.incr(self._get_generation_key("search"))
+        batch.incr_existing(self._get_count_cache_key(), len(created_users))
+        if self.response_cache is not None:
+            self.response_cache.add_list_invalidation(batch)
+        await batch.execute()
+        
+        return created_users
+    
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Получить пользователя по ID (read-through)"""
+        # Сначала проверяем L1 и Redis
+        cached_user = await self._get_cached_body(user_id)
+        if cached_user is ABSENT:
+            return None
+        if cached_user:
+            return cached_user
+        
+        # Если в кеше нет, получаем из БД (одна загрузка на все одновременные промахи)
         cache_key = self._get_user_cache_key(user_id, "id")
-        
-        # Сначала проверяем кеш
-        cached_data = await self.redis_client.get_json(cache_key)
-        if cached_data:
-            return await self._dict_to_user(cached_data)
-        
-        # Если в кеше нет, получаем из БД
-        user = await self.db_repository.get_by_id(user_id)
-        if user:
-            # Кешируем полученного пользователя
-            await self._cache_user(user)
-        
-        return user
+        return await self._load_coalesced(
+            cache_key,
+            lambda: self._get_cached_body(user_id),
+            lambda: self._load_user(cache_key, lambda: self.db_repository.get_by_id(user_id))
+        )
     
     async def get_by_username(self, username: str) -> Optional[User]:
         """Получить пользователя по username (read-through)"""
-        cache_key = self._get_user_cache_key(username, "username")
-        
         # Сначала проверяем кеш
-        cached_data = await self.redis_client.get_json(cache_key)
-        if cached_data:
-            return await self._dict_to_user(cached_data)
-        
-        # Если в кеше нет, получаем из БД
-        user = await self.db_repository.get_by_username(username)
-        if user:
-            # Кешируем полученного пользователя
-            await self._cache_user(user)
-        
-        return user
+        cached_user = await self._get_by_pointer("username", username)
+        if cached_user is ABSENT:
+            return None
+        if cached_user:
+            return cached_user
+        
+        # Если в кеше нет, получаем из БД и кешируем результат (или надгробие)
+        return await self._load_user(
+            self._get_user_cache_key(username, "username"),
+            lambda: self.db_repository.get_by_username(username)
+        )
     
     async def get_by_email(self, email: str) -> Optional[User]:
         """Получить пользователя по email (read-through)"""
-        cache_key = self._get_user_cache_key(email, "email")
-        
         # Сначала проверяем кеш
-        cached_data = await self.redis_client.get_json(cache_key)
-        if cached_data:
-            return await self._dict_to_user(cached_data)
-        
-        # Если в кеше нет, получаем из БД
-        user = await self.db_repository.get_by_email(email)
-        if user:
-            # Кешируем полученного пользователя
-            await self._cache_user(user)
-        
-        return user
+        cached_user = await self._get_by_pointer("email", email)
+        if cached_user is ABSENT:
+            return None
+        if cached_user:
+            return cached_user
+        
+        # Если в кеше нет, получаем из БД и кешируем результат (или надгробие)
+        return await self._load_user(
+            self._get_user_cache_key(email, "email"),
+            lambda: self.db_repository.get_by_email(email)
+        )
     
-    async def search_by_name(self, name: str) -> List[User]:
-        """Поиск пользователей по имени (read-through)"""
-        cache_key = self._get_search_cache_key(name)
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[User]:
+        """Поиск пользователей по имени (read-through, кешируется каждая страница)"""
+        cache_key = self._get_search_cache_key(await self._get_generation("search"), name, limit, offset)
         
-        # Проверяем кеш
-        cached_data = await self.redis_client.get_json(cache_key)
-        if cached_data:
-            users = []
-            for user_data in cached_data:
-                users.append(await self._dict_to_user(user_data))
-            return users
-        
-        # Если в кеше нет, получаем из БД
-        users = await self.db_repository.search_by_name(name)
-        
-        # Кешируем результат поиска
-        if users:
-            users_data = []
-            for user in users:
-                users_data.append(await self._user_to_dict(user))
-            await self.redis_client.set_json(cache_key, users_data, self.cache_ttl)
-        
-        return users
+        # Проверяем кеш (устаревшая страница отдается и обновляется в фоне)
+        refresh = lambda repository: self._load_page(
+            cache_key, lambda: repository.search_by_name(name, limit, offset)
+        )
+        cached_users = await self._get_cached_page(cache_key, refresh)
+        if cached_users is not None:
+            return cached_users
+        
+        # Если в кеше нет, получаем из БД и кешируем результат поиска
+        return await self._load_coalesced(
+            cache_key,
+            lambda: self._get_cached_page(cache_key),
+            lambda: self._load_page(cache_key, lambda: self.db_repository.search_by_name(name, limit, offset))
+        )
+    
+    async def count_by_name(self, name: str) -> int:
+        """Количество результатов поиска (read-through, в поколении поиска)"""
+        cache_key = self._get_search_count_cache_key(await self._get_generation("search"), name)
+        return await self._get_cached_count(
+            cache_key, lambda: self.db_repository.count_by_name(name), self.page_ttl_policy.expire()
+        )
     
     async def update(self, user: User) -> User:
         """Обновить пользователя (write-through)"""
-        # Сначала получаем старые данные для инвалидации кеша
-        old_user = await self.db_repository.get_by_id(user.id)
-        
-        # Обновляем в БД
-        updated_user = await self.db_repository.update(user)
-        
-        # Инвалидируем старый кеш
-        if old_user:
-            await self._invalidate_user_cache(old_user)
-        
-        # Кешируем новые данные
-        await self._cache_user(updated_user)
-        
+        _, updated_user = await self.update_with_previous(user)
         return updated_user
     
+    async def update_with_previous(self, user: User) -> Tuple[User, User]:
+        """Обновить пользователя и вернуть прежнее и новое состояние (write-through)"""
+        # Обновляем в БД; прежнее состояние для инвалидации возвращает тот же запрос
+        old_user, updated_user = await self.db_repository.update_with_previous(user)
+        
+        # Тело пользователя перезаписывается, устаревшие указатели удаляются точечно.
+        # Состав страниц списка от обновления не меняется, а результаты поиска -
+        # только при изменении username или full_name.
+        batch = self.redis_client.batch()
+        if old_user.username != updated_user.username:
+            batch.delete(self._get_user_cache_key(old_user.username, "username"))
+        if old_user.email != updated_user.email:
+            batch.delete(self._get_user_cache_key(old_user.email, "email"))
+        self._add_user_to_batch(batch, updated_user)
+        self._publish_invalidation(batch, updated_user.id)
+        if (
+            old_user.username != updated_user.username
+            or old_user.full_name != updated_user.full_name
+        ):
+            batch.incr(self._get_generation_key("search"))
+        await batch.execute()
+        
+        return old_user, updated_user
+    
     async def delete(self, user_id: str) -> bool:
         """Удалить пользователя (write-through)"""
-        # Сначала получаем пользователя для инвалидации кеша
-        user = await self.db_repository.get_by_id(user_id)
-        
-        # Удаляем из БД
-        result = await self.db_repository.delete(user_id)
+        return await self.delete_returning(user_id) is not None
+    
+    async def delete_returning(self, user_id: str) -> Optional[User]:
+        """Удалить пользователя и вернуть удаленную запись (write-through)"""
+        # Удаляем из БД; удаленная запись нужна для инвалидации ее ключей
+        user = await self.db_repository.delete_returning(user_id)
         
         # Инвалидируем кеш
-        if user and result:
-            await self._invalidate_user_cache(user)
+        if user:
+            batch = self.redis_client.batch()
+            batch.delete(*self._get_user_cache_keys(user))
+            self._publish_invalidation(batch, user.id)
+            batch.incr(self._get_generation_key("list"))
+            batch.incr(self._get_generation_key("search"))
+            batch.incr_existing(self._get_count_cache_key(), -1)
+            await batch.execute()
         
-        return result
+        return user
     
     async def get_all(self, limit: int = 100, offset: int = 0) -> List[User]:
         """Получить всех пользователей с пагинацией (read-through)"""
-        cache_key = self._get_users_list_cache_key(limit, offset)
-        
-        # Проверяем кеш
-        cached_data = await self.redis_client.get_json(cache_key)
-        if cached_data:
-            users = []
-            for user_data in cached_data:
-                users.append(await self._dict_to_user(user_data))
-            return users
-        
-        # Если в кеше нет, получаем из БД
-        users = await self.db_repository.get_all(limit, offset)
-        
-        # Кешируем результат
-        if users:
-            users_data = []
-            for user in users:
-                users_data.append(await self._user_to_dict(user))
-            await self.redis_client.set_json(cache_key, users_data, self.cache_ttl)
-        
-        return users
+        cache_key = self._get_users_list_cache_key(await self._get_generation("list"), limit, offset)
+        
+        # Проверяем кеш (устаревшая страница отдается и обновляется в фоне)
+        refresh = lambda repository: self._load_page(cache_key, lambda: repository.get_all(limit, offset))
+        cached_users = await self._get_cached_page(cache_key, refresh)
+        if cached_users is not None:
+            return cached_users
+        
+        # Если в кеше нет, получаем из БД и кешируем результат
+        return await self._load_coalesced(
+            cache_key,
+            lambda: self._get_cached_page(cache_key),
+            lambda: self._load_page(cache_key, lambda: self.db_repository.get_all(limit, offset))
+        )
+    
+    async def count(self, estimate: bool = False) -> int:
+        """Количество пользователей (read-through).
+        
+        Точный счетчик загружается COUNT(*) один раз, а затем поддерживается
+        записями: create/delete меняют его на +-1, только если он уже в кеше.
+        """
+        return await self._get_cached_count(
+            self._get_count_cache_key(estimate),
+            lambda: self.db_repository.count(estimate),
+            self.count_estimate_ttl if estimate else self.count_ttl
+        )
+    
+    async def get_page(self, limit: int = 100, after: Optional[UserCursor] = None) -> List[User]:
+        """Получить страницу пользователей после курсора (read-through)"""
+        cache_key = self._get_users_page_cache_key(await self._get_generation("list"), limit, after)
+        
+        # Проверяем кеш (устаревшая страница отдается и обновляется в фоне)
+        refresh = lambda repository: self._load_page(cache_key, lambda: repository.get_page(limit, after))
+        cached_users = await self._get_cached_page(cache_key, refresh)
+        if cached_users is not None:
+            return cached_users
+        
+        # Если в кеше нет, получаем из БД и кешируем результат
+        return await self._load_coalesced(
+            cache_key,
+            lambda: self._get_cached_page(cache_key),
+            lambda: self._load_page(cache_key, lambda: self.db_repository.get_page(limit, after))
+        )
 
 
 class CachedUserProfileRepository(UserProfileRepository):
     """Кеширующий репозиторий профилей пользователей"""
     
-    def __init__(self, db_repository: SQLAlchemyUserProfileRepository, redis_client: RedisClient):
+    def __init__(
+        self,
+        db_repository: SQLAlchemyUserProfileRepository,
+        redis_client: RedisClient,
+        codec: Optional[CacheCodec] = None
+    ):
         self.db_repository = db_repository
         self.redis_client = redis_client
         self.cache_ttl = 3600  # TTL для кеша - 1 час
+        self.codec = codec or create_codec()
     
     def _get_profile_cache_key(self, user_id: str) -> str:
         """Генерация ключа кеша для профиля"""
         return f"profile:user:{user_id}"
     
-    async def _profile_to_dict(self, profile: UserProfile) -> dict:
-        """Преобразование UserProfile в словарь"""
-        return {
-            "user_id": profile.user_id,
-            "phone": profile.phone,
-            "address": profile.address,
-            "bio": profile.bio,
-            "avatar_url": profile.avatar_url,
-            "skills": profile.skills,
-            "rating": profile.rating,
-            "reviews_count": profile.reviews_count,
-            "created_at": profile.created_at.isoformat() if profile.created_at else None,
-            "updated_at": profile.updated_at.isoformat() if profile.updated_at else None,
-        }
-    
-    async def _dict_to_profile(self, data: dict) -> UserProfile:
-        """Преобразование словаря в UserProfile"""
-        from datetime import datetime
-        
-        return UserProfile(
-            user_id=data["user_id"],
-            phone=data["phone"],
-            address=data["address"],
-            bio=data["bio"],
-            avatar_url=data["avatar_url"],
-            skills=data["skills"],
-            rating=data["rating"],
-            reviews_count=data["reviews_count"],
-            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
-        )
+    async def _set_profile(self, profile: UserProfile):
+        """Записать профиль в кеш"""
+        cache_key = self._get_profile_cache_key(profile.user_id)
+        await self.redis_client.set(cache_key, self.codec.encode(profile_to_record(profile)), self.cache_ttl)
     
     async def create(self, profile: UserProfile) -> UserProfile:
         """Создать профиль (write-through)"""
         created_profile = await self.db_repository.create(profile)
         
         # Кешируем созданный профиль
-        cache_key = self._get_profile_cache_key(created_profile.user_id)
-        profile_dict = await self._profile_to_dict(created_profile)
-        await self.redis_client.set_json(cache_key, profile_dict, self.cache_ttl)
+        await self._set_profile(created_profile)
         
         return created_profile
     
@@ -292,16 +662,18 @@ class CachedUserProfileRepository(UserProfileRepository):
         cache_key = self._get_profile_cache_key(user_id)
         
         # Проверяем кеш
-        cached_data = await self.redis_client.get_json(cache_key)
-        if cached_data:
-            return await self._dict_to_profile(cached_data)
+        cached_value = await self.redis_client.get_bytes(cache_key)
+        if cached_value:
+            try:
+                return record_to_profile(self.codec.decode(cached_value))
+            except Exception:
+                pass  # значение старого формата - перечитываем из БД
         
         # Если в кеше нет, получаем из БД
         profile = await self.db_repository.get_by_user_id(user_id)
         if profile:
             # Кешируем профиль
-            profile_dict = await self._profile_to_dict(profile)
-            await self.redis_client.set_json(cache_key, profile_dict, self.cache_ttl)
+            await self._set_profile(profile)
         
         return profile
     
@@ -310,9 +682,7 @@ class CachedUserProfileRepository(UserProfileRepository):
         updated_profile = await self.db_repository.update(profile)
         
         # Обновляем кеш
-        cache_key = self._get_profile_cache_key(updated_profile.user_id)
-        profile_dict = await self._profile_to_dict(updated_profile)
-        await self.redis_client.set_json(cache_key, profile_dict, self.cache_ttl)
+        await self._set_profile(updated_profile)
         
         return updated_profile
     
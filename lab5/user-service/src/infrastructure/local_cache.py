@@ -0,0 +1,92 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Optional, Any, Tuple
+
+from .redis_client import RedisClient
+
+# Канал Redis pub/sub, через который воркеры сообщают об изменении пользователей
+USER_INVALIDATION_CHANNEL = "users:invalidate"
+
+
+class LocalCache:
+    """Ограниченный in-process LRU кеш с TTL (L1 перед Redis).
+    
+    Кеш обслуживает чтения только пока активна подписка на канал
+    инвалидации: без нее воркер не узнает о записях других воркеров.
+    """
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = False
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Получить значение, если оно есть и не истекло"""
+        if not self.enabled:
+            return None
+        
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any):
+        """Сохранить значение, вытесняя самые старые записи"""
+        if not self.enabled or self.max_size <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def delete(self, *keys: str):
+        """Удалить значения"""
+        for key in keys:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Очистить кеш"""
+        self._entries.clear()
+    
+    async def listen_invalidations(self, redis_client: RedisClient, channel: str):
+        """Слушать канал инвалидации и удалять затронутые ключи.
+        
+        При каждой (пере)подписке кеш очищается, так как сообщения,
+        отправленные во время разрыва соединения, потеряны.
+        """
+        while True:
+            try:
+                async for message in redis_client.subscribe(channel):
+                    if message is None:
+                        # Подписка установлена
+                        self.clear()
+                        self.enabled = True
+                        continue
+                    self.delete(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"L1 cache invalidation listener error: {e}")
+            finally:
+                self.enabled = False
+                self.clear()
+            
+            await asyncio.sleep(1)
+
+
+# Глобальный L1 кеш пользователей (размер и TTL задаются через окружение)
+user_local_cache = LocalCache(
+    max_size=int(os.getenv("USER_L1_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_L1_CACHE_TTL", "30")),
+)
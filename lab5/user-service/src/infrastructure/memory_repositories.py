@@ -1,9 +1,9 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import copy
 from datetime import datetime
 from uuid import uuid4
 
-from ..domain.entities import User, UserProfile, UserRole
+from ..domain.entities import User, UserProfile, UserRole, UserCursor
 from ..repository.interfaces import UserRepository, UserProfileRepository
 
 
@@ -27,6 +27,19 @@ class InMemoryUserRepository(UserRepository):
         
         return copy.deepcopy(user_copy)
     
+    async def bulk_create(self, users: List[User], warm_cache: bool = False) -> List[User]:
+        """Создать пользователей пакетом, пропуская конфликты"""
+        created = []
+        for user in users:
+            if (
+                user.id in self._users
+                or user.username in self._username_index
+                or user.email in self._email_index
+            ):
+                continue
+            created.append(await self.create(user))
+        return created
+    
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Получить пользователя по ID"""
         user = self._users.get(user_id)
@@ -48,20 +61,39 @@ class InMemoryUserRepository(UserRepository):
             return copy.deepcopy(user) if user else None
         return None
     
-    async def search_by_name(self, name: str) -> List[User]:
+    def _find_by_name(self, name: str) -> List[User]:
+        """Пользователи, подходящие под маску имени"""
+        name_lower = name.lower()
+        return [
+            user for user in self._users.values()
+            if name_lower in user.full_name.lower() or name_lower in user.username.lower()
+        ]
+    
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[User]:
         """Поиск пользователей по имени"""
         name_lower = name.lower()
-        results = []
-        
-        for user in self._users.values():
-            if (name_lower in user.full_name.lower() or 
-                name_lower in user.username.lower()):
-                results.append(copy.deepcopy(user))
-        
-        return results
+        # Релевантность: сначала совпадения с начала username или full_name
+        results = sorted(
+            self._find_by_name(name),
+            key=lambda u: (
+                not (u.username.lower().startswith(name_lower) or u.full_name.lower().startswith(name_lower)),
+                u.username
+            )
+        )
+        
+        return [copy.deepcopy(user) for user in results[offset:offset + limit]]
+    
+    async def count_by_name(self, name: str) -> int:
+        """Количество пользователей, найденных по имени"""
+        return len(self._find_by_name(name))
     
     async def update(self, user: User) -> User:
         """Обновить пользователя"""
+        _, updated_user = await self.update_with_previous(user)
+        return updated_user
+    
+    async def update_with_previous(self, user: User) -> Tuple[User, User]:
+        """Обновить пользователя и вернуть его прежнее и новое состояние"""
         if user.id not in self._users:
             raise ValueError(f"User with id {user.id} not found")
         
@@ -79,30 +111,46 @@ class InMemoryUserRepository(UserRepository):
         user_copy = copy.deepcopy(user)
         self._users[user.id] = user_copy
         
-        return copy.deepcopy(user_copy)
+        return copy.deepcopy(old_user), copy.deepcopy(user_copy)
     
     async def delete(self, user_id: str) -> bool:
         """Удалить пользователя"""
+        return await self.delete_returning(user_id) is not None
+    
+    async def delete_returning(self, user_id: str) -> Optional[User]:
+        """Удалить пользователя и вернуть удаленную запись"""
         user = self._users.get(user_id)
         if not user:
-            return False
+            return None
         
         # Удаляем из индексов
         del self._username_index[user.username]
         del self._email_index[user.email]
         del self._users[user_id]
         
-        return True
+        return copy.deepcopy(user)
     
     async def get_all(self, limit: int = 100, offset: int = 0) -> List[User]:
         """Получить всех пользователей с пагинацией"""
         users = list(self._users.values())
-        users.sort(key=lambda u: u.created_at)  # Сортировка по дате создания
+        users.sort(key=lambda u: (u.created_at, u.id))  # Сортировка по дате создания
         
         start = offset
         end = offset + limit
         
         return [copy.deepcopy(user) for user in users[start:end]]
+    
+    async def count(self, estimate: bool = False) -> int:
+        """Количество пользователей"""
+        return len(self._users)
+    
+    async def get_page(self, limit: int = 100, after: Optional[UserCursor] = None) -> List[User]:
+        """Получить страницу пользователей после курсора"""
+        users = sorted(self._users.values(), key=lambda u: (u.created_at, u.id))
+        if after is not None:
+            users = [u for u in users if (u.created_at, u.id) > (after.created_at, after.id)]
+        
+        return [copy.deepcopy(user) for user in users[:limit]]
 
 
 class InMemoryUserProfileRepository(UserProfileRepository):
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Float, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Float, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.sql import func
 
@@ -20,6 +20,20 @@ class UserModel(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Keyset-пагинация по (created_at, id)
+        Index("idx_users_created_at_id", "created_at", "id"),
+        # Поиск по маске имени (ILIKE '%...%') через pg_trgm
+        Index(
+            "idx_users_username_trgm", "username",
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}
+        ),
+        Index(
+            "idx_users_full_name_trgm", "full_name",
+            postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}
+        ),
+    )
+
 
 class UserProfileModel(Base):
     __tablename__ = "user_profiles"
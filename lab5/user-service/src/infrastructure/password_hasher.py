@@ -0,0 +1,93 @@
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import bcrypt
+
+from ..repository.interfaces import PasswordHasher
+
+
+class BcryptPasswordHasher(PasswordHasher):
+    """Хеширование паролей bcrypt вне event loop.
+
+    bcrypt отпускает GIL, поэтому хеши считаются параллельно в ограниченном
+    пуле потоков, а event loop воркера продолжает обслуживать другие запросы.
+    Семафор ограничивает число одновременно выполняемых и ожидающих в пуле
+    операций: всплеск логинов ждет своей очереди, а не растит очередь пула.
+    Массовый импорт хеширует в отдельном небольшом пуле со своим семафором
+    и не занимает потоки и очередь, которые обслуживают логин и регистрацию.
+    """
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        bulk_workers: int = 1
+    ):
+        self.rounds = rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.max_workers * 2
+        self.bulk_workers = bulk_workers
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._bulk_executor = ThreadPoolExecutor(max_workers=self.bulk_workers, thread_name_prefix="bcrypt-bulk")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bulk_semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls) -> "BcryptPasswordHasher":
+        """Настройки из BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_CONCURRENCY и PASSWORD_HASH_BULK_WORKERS"""
+        workers = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+        concurrency = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "0"))
+        return cls(
+            rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+            max_workers=workers or None,
+            max_concurrency=concurrency or None,
+            bulk_workers=max(1, int(os.getenv("PASSWORD_HASH_BULK_WORKERS", "1"))),
+        )
+
+    async def _run(self, func, *args):
+        """Выполнить функцию в пуле с учетом ограничения конкурентности"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _run_bulk(self, func, *args):
+        """Выполнить функцию в пуле массовых операций"""
+        if self._bulk_semaphore is None:
+            self._bulk_semaphore = asyncio.Semaphore(self.bulk_workers)
+        async with self._bulk_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._bulk_executor, func, *args)
+
+    def _hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds)).decode('utf-8')
+
+    def _verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        except ValueError:
+            # Некорректный хеш в БД - пароль не совпадает
+            return False
+
+    async def hash(self, password: str) -> str:
+        """Хеш пароля"""
+        return await self._run(self._hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Проверить пароль по хешу"""
+        return await self._run(self._verify, password, hashed_password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Хеши нескольких паролей в пуле массовых операций"""
+        return list(await asyncio.gather(*(self._run_bulk(self._hash, password) for password in passwords)))
+
+    def shutdown(self):
+        """Остановить пулы потоков"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._bulk_executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Глобальный экземпляр сервиса хеширования паролей
+password_hasher = BcryptPasswordHasher.from_env()
@@ -1,11 +1,75 @@
 import os
 import json
-from typing import Optional, Any
+from typing import Optional, Any, List, AsyncIterator, Union
 import redis.asyncio as redis
 
+# INCRBY только для существующего ключа: не создает счетчик, который не был загружен из БД
+_INCR_EXISTING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+class RedisBatch:
+    """Набор команд Redis, отправляемых одним round trip (pipeline/MULTI)"""
+    
+    def __init__(self, connection: Optional[redis.Redis], transaction: bool = True):
+        self._pipe = connection.pipeline(transaction=transaction) if connection else None
+        self._size = 0
+    
+    def set(self, key: str, value: Union[str, bytes], expire: Optional[int] = None) -> "RedisBatch":
+        """Добавить SET"""
+        if self._pipe is not None:
+            self._pipe.set(key, value, ex=expire)
+            self._size += 1
+        return self
+    
+    def delete(self, *keys: str) -> "RedisBatch":
+        """Добавить DEL"""
+        if self._pipe is not None and keys:
+            self._pipe.delete(*keys)
+            self._size += 1
+        return self
+    
+    def publish(self, channel: str, message: str) -> "RedisBatch":
+        """Добавить PUBLISH"""
+        if self._pipe is not None:
+            self._pipe.publish(channel, message)
+            self._size += 1
+        return self
+    
+    def incr(self, key: str) -> "RedisBatch":
+        """Добавить INCR"""
+        if self._pipe is not None:
+            self._pipe.incr(key)
+            self._size += 1
+        return self
+    
+    def incr_existing(self, key: str, amount: int = 1) -> "RedisBatch":
+        """Добавить INCRBY, выполняемый только если ключ уже есть"""
+        if self._pipe is not None:
+            self._pipe.eval(_INCR_EXISTING_SCRIPT, 1, key, amount)
+            self._size += 1
+        return self
+    
+    async def execute(self) -> List[Any]:
+        """Отправить накопленные команды"""
+        if self._pipe is None or self._size == 0:
+            return []
+        try:
+            return await self._pipe.execute()
+        finally:
+            self._size = 0
+            await self._pipe.reset()
+
 
 class RedisClient:
-    """Redis клиент для кеширования"""
+    """Redis клиент для кеширования.
+    
+    Соединение работает с bytes, чтобы хранить значения бинарных кодеков;
+    строковые методы (get, get_json, ...) декодируют ответы сами.
+    """
     
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
@@ -16,7 +80,7 @@ class RedisClient:
         self.redis = redis.from_url(
             redis_url,
             encoding="utf-8",
-            decode_responses=True
+            decode_responses=False
         )
         # Проверяем соединение
         await self.redis.ping()
@@ -28,11 +92,16 @@ class RedisClient:
     
     async def get(self, key: str) -> Optional[str]:
         """Получить значение из кеша"""
+        value = await self.get_bytes(key)
+        return value.decode("utf-8") if value is not None else None
+    
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Получить значение из кеша без декодирования"""
         if self.redis:
             return await self.redis.get(key)
         return None
     
-    async def set(self, key: str, value: str, expire: Optional[int] = None):
+    async def set(self, key: str, value: Union[str, bytes], expire: Optional[int] = None):
         """Установить значение в кеш"""
         if self.redis:
             await self.redis.set(key, value, ex=expire)
@@ -57,12 +126,66 @@ class RedisClient:
         json_str = json.dumps(value, default=str)
         await self.set(key, json_str, expire)
     
+    async def acquire_lock(self, key: str, ttl_ms: int) -> bool:
+        """Захватить короткую блокировку (SET NX PX)"""
+        if self.redis:
+            return bool(await self.redis.set(key, "1", nx=True, px=ttl_ms))
+        return True
+    
+    async def get_many_bytes(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Получить несколько значений одной командой MGET без декодирования"""
+        if self.redis and keys:
+            return await self.redis.mget(keys)
+        return [None] * len(keys)
+    
+    def batch(self, transaction: bool = True) -> RedisBatch:
+        """Создать набор команд для выполнения за один round trip"""
+        return RedisBatch(self.redis, transaction=transaction)
+    
+    async def subscribe(self, channel: str) -> AsyncIterator[Optional[str]]:
+        """Подписаться на канал pub/sub.
+        
+        Первым элементом выдается None - признак того, что подписка
+        установлена, далее - данные сообщений.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis is not connected")
+        
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            yield None
+            while True:
+                message = await pubsub.get_message(timeout=None)
+                if message and message["type"] == "message":
+                    yield message["data"].decode("utf-8")
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+    
     async def clear_pattern(self, pattern: str):
         """Удалить все ключи по паттерну"""
-        if self.redis:
-            keys = await self.redis.keys(pattern)
-            if keys:
-                await self.redis.delete(*keys)
+        await self.clear_patterns(pattern)
+    
+    async def clear_patterns(self, *patterns: str):
+        """Удалить все ключи по нескольким паттернам.
+        
+        Используется SCAN вместо KEYS, чтобы не блокировать Redis
+        на время обхода всего пространства ключей. Метод предназначен
+        для служебных операций, а не для горячего пути инвалидации.
+        """
+        if not self.redis:
+            return
+        
+        for pattern in patterns:
+            batch = []
+            async for key in self.redis.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await self.redis.delete(*batch)
+                    batch = []
+            if batch:
+                await self.redis.delete(*batch)
 
 
 # Глобальный экземпляр Redis клиента
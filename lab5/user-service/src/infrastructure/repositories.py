@@ -1,19 +1,38 @@
-from typing import Optional, List
+import os
+from typing import Optional, List, Tuple
 from datetime import datetime
 from uuid import uuid4, UUID
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, delete, and_, or_, tuple_, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..domain.entities import User, UserProfile, UserRole
+from ..domain.entities import User, UserProfile, UserRole, UserCursor
 from ..repository.interfaces import UserRepository, UserProfileRepository
 from .models import UserModel, UserProfileModel
 from .database import get_async_session
 
+# Режим поиска по имени: trigram (GIN индексы pg_trgm и ранжирование по similarity)
+# или ilike (исходный запрос без ранжирования, если pg_trgm недоступен)
+USER_SEARCH_MODE = os.getenv("USER_SEARCH_MODE", "trigram")
+
+# Пакетная вставка: до BULK_INSERT_CHUNK строк в одном INSERT ... VALUES
+# (7 параметров на строку, у asyncpg предел 32767), начиная с
+# USER_BULK_COPY_THRESHOLD строк - COPY во временную таблицу
+BULK_INSERT_CHUNK = 1000
+USER_BULK_COPY_THRESHOLD = int(os.getenv("USER_BULK_COPY_THRESHOLD", "5000"))
+
 
 class SQLAlchemyUserRepository(UserRepository):
     """SQLAlchemy реализация репозитория пользователей"""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        search_mode: str = USER_SEARCH_MODE,
+        copy_threshold: int = USER_BULK_COPY_THRESHOLD
+    ):
         self.session = session
+        self.search_mode = search_mode
+        self.copy_threshold = copy_threshold
     
     async def create(self, user: User) -> User:
         """Создать пользователя"""
@@ -32,6 +51,70 @@ class SQLAlchemyUserRepository(UserRepository):
         
         return self._model_to_entity(db_user)
     
+    async def bulk_create(self, users: List[User], warm_cache: bool = False) -> List[User]:
+        """Создать пользователей пакетом в одной транзакции.
+        
+        Небольшие пакеты вставляются многострочным INSERT ... ON CONFLICT DO NOTHING,
+        большие - через COPY во временную таблицу и INSERT ... SELECT с тем же
+        ON CONFLICT. Созданные строки возвращаются через RETURNING.
+        """
+        if not users:
+            return []
+        
+        rows = [self._entity_to_row(user) for user in users]
+        if len(rows) >= self.copy_threshold:
+            created = await self._copy_insert(rows)
+        else:
+            users_table = UserModel.__table__
+            created = []
+            for start in range(0, len(rows), BULK_INSERT_CHUNK):
+                stmt = (
+                    pg_insert(users_table)
+                    .values(rows[start:start + BULK_INSERT_CHUNK])
+                    .on_conflict_do_nothing()
+                    .returning(*users_table.c)
+                )
+                result = await self.session.execute(stmt)
+                created.extend(self._row_to_entity(row) for row in result.mappings())
+        
+        await self.session.commit()
+        return created
+    
+    async def _copy_insert(self, rows: List[dict]) -> List[User]:
+        """Загрузить строки через COPY (asyncpg copy_records_to_table) и перенести их в users"""
+        columns = list(rows[0].keys())
+        column_list = ", ".join(columns)
+        
+        await self.session.execute(
+            text("CREATE TEMP TABLE users_import (LIKE users INCLUDING DEFAULTS) ON COMMIT DROP")
+        )
+        # COPY выполняется тем же соединением, внутри транзакции сессии
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "users_import",
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns
+        )
+        
+        result = await self.session.execute(text(
+            f"INSERT INTO users ({column_list}) SELECT {column_list} FROM users_import "
+            f"ON CONFLICT DO NOTHING RETURNING *"
+        ))
+        return [self._row_to_entity(row) for row in result.mappings()]
+    
+    def _entity_to_row(self, user: User) -> dict:
+        """Значения колонок users для пакетной вставки (даты ставит БД)"""
+        return {
+            "id": UUID(user.id) if user.id else uuid4(),
+            "username": user.username,
+            "email": user.email,
+            "password_hash": user.hashed_password,
+            "full_name": user.full_name,
+            "role": user.role.value,
+            "is_active": user.is_active,
+        }
+    
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Получить пользователя по ID"""
         stmt = select(UserModel).where(UserModel.id == UUID(user_id))
@@ -62,63 +145,155 @@ class SQLAlchemyUserRepository(UserRepository):
             return self._model_to_entity(db_user)
         return None
     
-    async def search_by_name(self, name: str) -> List[User]:
-        """Поиск пользователей по имени"""
-        stmt = select(UserModel).where(
-            or_(
-                UserModel.username.ilike(f"%{name}%"),
-                UserModel.full_name.ilike(f"%{name}%")
+    def _name_filter(self, name: str):
+        """Условие поиска по маске имени"""
+        return or_(
+            UserModel.username.ilike(f"%{name}%"),
+            UserModel.full_name.ilike(f"%{name}%")
+        )
+    
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[User]:
+        """Поиск пользователей по имени.
+        
+        ILIKE '%маска%' обслуживается GIN индексами gin_trgm_ops по username
+        и full_name; в режиме trigram результаты упорядочены по similarity.
+        Уникальный username в конце сортировки делает страницы детерминированными.
+        """
+        stmt = select(UserModel).where(self._name_filter(name)).offset(offset).limit(limit)
+        
+        if self.search_mode == "trigram":
+            score = func.greatest(
+                func.similarity(UserModel.username, name),
+                func.coalesce(func.similarity(UserModel.full_name, name), 0)
             )
-        ).limit(50)  # Ограничиваем результаты поиска
+            stmt = stmt.order_by(score.desc(), UserModel.username)
+        else:
+            stmt = stmt.order_by(UserModel.username)
         
         result = await self.session.execute(stmt)
         db_users = result.scalars().all()
         
         return [self._model_to_entity(db_user) for db_user in db_users]
     
+    async def count_by_name(self, name: str) -> int:
+        """Количество пользователей, найденных по имени"""
+        stmt = select(func.count()).select_from(UserModel).where(self._name_filter(name))
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+    
     async def update(self, user: User) -> User:
         """Обновить пользователя"""
-        stmt = select(UserModel).where(UserModel.id == UUID(user.id))
-        result = await self.session.execute(stmt)
-        db_user = result.scalar_one_or_none()
+        _, updated_user = await self.update_with_previous(user)
+        return updated_user
+    
+    async def update_with_previous(self, user: User) -> Tuple[User, User]:
+        """Обновить пользователя одним запросом UPDATE ... RETURNING.
         
-        if not db_user:
-            raise ValueError(f"User with id {user.id} not found")
-        
-        # Обновляем поля
-        db_user.username = user.username
-        db_user.email = user.email
-        db_user.password_hash = user.hashed_password
-        db_user.full_name = user.full_name
-        db_user.role = user.role.value
-        db_user.is_active = user.is_active
+        Прежние значения строки читаются в CTE с блокировкой (FOR UPDATE)
+        и возвращаются тем же запросом - кешу не нужен отдельный SELECT
+        для поиска устаревших ключей.
+        """
+        users = UserModel.__table__
+        old = select(users).where(users.c.id == UUID(user.id)).with_for_update().cte("old")
         
+        stmt = (
+            update(users)
+            .where(users.c.id == old.c.id)
+            .values(
+                username=user.username,
+                email=user.email,
+                password_hash=user.hashed_password,
+                full_name=user.full_name,
+                role=user.role.value,
+                is_active=user.is_active
+            )
+            .returning(*users.c, *[column.label(f"old_{column.name}") for column in old.c])
+        )
+        result = await self.session.execute(stmt)
+        row = result.mappings().one_or_none()
         await self.session.commit()
-        await self.session.refresh(db_user)
         
-        return self._model_to_entity(db_user)
+        if row is None:
+            raise ValueError(f"User with id {user.id} not found")
+        
+        previous = {name[len("old_"):]: value for name, value in row.items() if name.startswith("old_")}
+        return self._row_to_entity(previous), self._row_to_entity(row)
     
     async def delete(self, user_id: str) -> bool:
         """Удалить пользователя"""
-        stmt = select(UserModel).where(UserModel.id == UUID(user_id))
+        return await self.delete_returning(user_id) is not None
+    
+    async def delete_returning(self, user_id: str) -> Optional[User]:
+        """Удалить пользователя одним запросом DELETE ... RETURNING"""
+        users = UserModel.__table__
+        stmt = delete(users).where(users.c.id == UUID(user_id)).returning(*users.c)
         result = await self.session.execute(stmt)
-        db_user = result.scalar_one_or_none()
-        
-        if not db_user:
-            return False
-        
-        await self.session.delete(db_user)
+        row = result.mappings().one_or_none()
         await self.session.commit()
-        return True
+        
+        return self._row_to_entity(row) if row is not None else None
     
     async def get_all(self, limit: int = 100, offset: int = 0) -> List[User]:
         """Получить всех пользователей с пагинацией"""
-        stmt = select(UserModel).offset(offset).limit(limit)
+        stmt = (
+            select(UserModel)
+            .order_by(UserModel.created_at, UserModel.id)
+            .offset(offset)
+            .limit(limit)
+        )
         result = await self.session.execute(stmt)
         db_users = result.scalars().all()
         
         return [self._model_to_entity(db_user) for db_user in db_users]
     
+    async def count(self, estimate: bool = False) -> int:
+        """Количество пользователей.
+        
+        В режиме estimate берется оценка планировщика pg_class.reltuples,
+        которая не требует обхода таблицы; если статистика еще не собрана
+        (reltuples < 0), выполняется точный COUNT(*).
+        """
+        if estimate:
+            result = await self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+            )
+            estimated = result.scalar_one_or_none()
+            if estimated is not None and estimated >= 0:
+                return int(estimated)
+        
+        result = await self.session.execute(select(func.count()).select_from(UserModel))
+        return result.scalar_one()
+    
+    async def get_page(self, limit: int = 100, after: Optional[UserCursor] = None) -> List[User]:
+        """Получить страницу пользователей после курсора (keyset-пагинация).
+        
+        Сравнение (created_at, id) > курсор обслуживается индексом
+        idx_users_created_at_id, поэтому стоимость не растет с глубиной страницы.
+        """
+        stmt = select(UserModel).order_by(UserModel.created_at, UserModel.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(UserModel.created_at, UserModel.id) > tuple_(after.created_at, UUID(after.id))
+            )
+        result = await self.session.execute(stmt)
+        db_users = result.scalars().all()
+        
+        return [self._model_to_entity(db_user) for db_user in db_users]
+    
+    def _row_to_entity(self, row) -> User:
+        """Преобразование строки RETURNING (колонки таблицы users) в доменную сущность"""
+        return User(
+            id=str(row["id"]),
+            username=row["username"],
+            email=row["email"],
+            full_name=row["full_name"],
+            hashed_password=row["password_hash"],
+            role=UserRole(row["role"]),
+            is_active=row["is_active"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"]
+        )
+    
     def _model_to_entity(self, db_user: UserModel) -> User:
         """Преобразование модели SQLAlchemy в доменную сущность"""
         return User(
@@ -0,0 +1,68 @@
+import os
+from typing import Optional
+
+from .redis_client import RedisClient, RedisBatch, redis_client
+
+
+class ResponseCache:
+    """Кеш готовых JSON тел HTTP ответов для горячих эндпоинтов чтения.
+
+    Ответы списков хранятся под ключом запроса и текущего поколения
+    users:resp:gen, которое увеличивается при любой записи пользователя.
+    Ответы по одному пользователю не зависят от поколения и удаляются
+    по id при изменении этого пользователя.
+    """
+
+    def __init__(self, redis_client: RedisClient, ttl: int = 60, enabled: bool = True):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.enabled = enabled
+
+    @classmethod
+    def from_env(cls, redis_client: RedisClient) -> "ResponseCache":
+        """Настройки из USER_RESPONSE_CACHE (on/off) и USER_RESPONSE_CACHE_TTL"""
+        return cls(
+            redis_client,
+            ttl=int(os.getenv("USER_RESPONSE_CACHE_TTL", "60")),
+            enabled=os.getenv("USER_RESPONSE_CACHE", "on").lower() in ("1", "on", "true", "yes"),
+        )
+
+    def _get_generation_key(self) -> str:
+        """Ключ счетчика поколения ответов"""
+        return "users:resp:gen"
+
+    def get_user_key(self, user_id: str) -> str:
+        """Ключ ответа по одному пользователю (общий для всех эндпоинтов UserResponse)"""
+        return f"users:resp:user:{user_id}"
+
+    async def get_list_key(self, endpoint: str, *params) -> str:
+        """Ключ ответа списка для текущего поколения"""
+        if not self.enabled:
+            return ""
+        generation = await self.redis_client.get(self._get_generation_key()) or "0"
+        query = ":".join("" if param is None else str(param) for param in params)
+        return f"users:resp:{generation}:{endpoint}:{query}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Получить готовое тело ответа"""
+        if not self.enabled:
+            return None
+        return await self.redis_client.get_bytes(key)
+
+    async def set(self, key: str, body: bytes):
+        """Сохранить готовое тело ответа"""
+        if self.enabled:
+            await self.redis_client.set(key, body, self.ttl)
+
+    def add_invalidation(self, batch: RedisBatch, user_id: str):
+        """Добавить в batch сброс ответов списков и ответа по пользователю"""
+        self.add_list_invalidation(batch)
+        batch.delete(self.get_user_key(user_id))
+    
+    def add_list_invalidation(self, batch: RedisBatch):
+        """Добавить в batch сброс ответов списков"""
+        batch.incr(self._get_generation_key())
+
+
+# Глобальный экземпляр кеша ответов пользователей
+user_response_cache = ResponseCache.from_env(redis_client)
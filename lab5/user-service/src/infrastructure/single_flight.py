@@ -0,0 +1,55 @@
+import asyncio
+from typing import Dict, Callable, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Объединение одновременных загрузок по одному ключу (single-flight).
+    
+    Первый вызов для ключа выполняет loader, остальные ждут его результат.
+    Если лидер отменен, ожидающие повторяют попытку сами.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+    
+    async def do(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        """Выполнить loader или дождаться уже выполняющейся загрузки"""
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # Лидер отменен - пробуем стать лидером сами
+        
+        future = asyncio.get_running_loop().create_future()
+        # Исключение может никто не забрать, если ожидающих нет
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        
+        future.set_result(result)
+        return result
+    
+    def is_loading(self, key: str) -> bool:
+        """Выполняется ли загрузка по ключу"""
+        return key in self._calls
+
+
+# Глобальный single-flight для промахов кеша пользователей (репозитории создаются на каждый запрос)
+user_single_flight = SingleFlight()
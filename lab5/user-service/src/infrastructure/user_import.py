@@ -0,0 +1,104 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator, List
+
+from ..domain.exceptions import ValidationError
+
+
+# Потоковый разбор входных данных пакетного импорта пользователей.
+# Вход - поток байтовых фрагментов (тело HTTP запроса или файл), выход -
+# записи-словари; весь файл в память не загружается.
+
+async def iter_text(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Декодировать поток байтов UTF-8 (символ может оказаться на границе фрагментов)"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        async for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ValidationError(f"Import data is not valid UTF-8: {e}")
+    if text:
+        yield text
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Разбить поток на строки, сохраняя перевод строки в конце"""
+    buffer = ""
+    async for text in iter_text(chunks):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if buffer:
+        yield buffer
+
+
+async def parse_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[dict]:
+    """Записи NDJSON (один JSON объект на строку).
+
+    Некорректная строка превращается в пустую запись, которую отклонит валидация.
+    """
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = {}
+        yield record if isinstance(record, dict) else {}
+
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[List[str]]:
+    """Строки CSV; поле в кавычках может содержать переводы строк.
+
+    Строки входа копятся, пока число кавычек нечетное (запись не закончена),
+    затем вся запись разбирается csv.reader.
+    """
+    record: List[str] = []
+    quotes = 0
+    async for line in iter_lines(chunks):
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        for values in csv.reader(record):
+            yield values
+        record, quotes = [], 0
+    if record:
+        for values in csv.reader(record):
+            yield values
+
+
+async def parse_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[dict]:
+    """Записи CSV с заголовком (username,email,full_name,password,...)"""
+    header: List[str] = []
+    async for values in iter_csv_rows(chunks):
+        if not any(value.strip() for value in values):
+            continue
+        if not header:
+            header = [name.strip() for name in values]
+            continue
+        yield dict(zip(header, values))
+
+
+async def read_file(path: str, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    """Читать файл фрагментами"""
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def parse_records(chunks: AsyncIterable[bytes], data_format: str) -> AsyncIterator[dict]:
+    """Выбрать разбор по формату: csv или ndjson"""
+    if data_format == "csv":
+        return parse_csv(chunks)
+    if data_format == "ndjson":
+        return parse_ndjson(chunks)
+    raise ValueError(f"Unsupported import format '{data_format}'")
@@ -1,19 +1,23 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional, Callable, Awaitable
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
+from pydantic import BaseModel
 
 from .models import (
     CreateUserRequest, LoginRequest, UpdateUserRequest, ChangePasswordRequest,
-    UserResponse, TokenResponse, MessageResponse, ErrorResponse, PaginatedUsersResponse
+    UserResponse, TokenResponse, MessageResponse, ErrorResponse, PaginatedUsersResponse,
+    BulkImportResponse
 )
 from .dependencies import (
     get_user_use_cases, get_jwt_service, get_current_user, 
-    get_current_active_user, get_admin_user
+    get_current_active_user, get_admin_user, get_response_cache
 )
 from ..use_cases.user_use_cases import UserUseCases
 from ..infrastructure.auth import JWTService
 from ..infrastructure.repositories import SQLAlchemyUserRepository
 from ..infrastructure.database import get_async_session
-from ..domain.entities import User, UserRole
+from ..infrastructure.response_cache import ResponseCache
+from ..infrastructure.user_import import parse_records
+from ..domain.entities import User, UserRole, UserCursor
 from ..domain.exceptions import (
     UserNotFound, DuplicateUser, 
     InvalidCredentials, ValidationError, AccessDenied
@@ -36,13 +40,25 @@ def create_user_response(user: User) -> UserResponse:
     )
 
 
-# Эндпоинты для тестирования производительности
-@router.get("/performance/users/{user_id}", response_model=UserResponse, tags=["performance-testing"])
-async def get_user_with_cache(
-    user_id: str,
-    user_use_cases: UserUseCases = Depends(get_user_use_cases)
-):
-    """Получить пользователя по ID с использованием кеша (для тестирования производительности)"""
+async def cached_json_response(
+    response_cache: ResponseCache,
+    cache_key: str,
+    build: Callable[[], Awaitable[BaseModel]]
+) -> Response:
+    """Отдать готовое JSON тело из кеша ответов или построить, сериализовать и сохранить его.
+    
+    При попадании доменные сущности и pydantic модели не создаются.
+    Ошибки (HTTPException) из build не кешируются.
+    """
+    body = await response_cache.get(cache_key)
+    if body is None:
+        body = (await build()).model_dump_json().encode("utf-8")
+        await response_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+async def build_user_response(user_use_cases: UserUseCases, user_id: str) -> UserResponse:
+    """Построить ответ по одному пользователю"""
     try:
         user = await user_use_cases.get_user_by_id(user_id)
         return create_user_response(user)
@@ -53,6 +69,21 @@ async def get_user_with_cache(
         )
 
 
+# Эндпоинты для тестирования производительности
+@router.get("/performance/users/{user_id}", response_model=UserResponse, tags=["performance-testing"])
+async def get_user_with_cache(
+    user_id: str,
+    user_use_cases: UserUseCases = Depends(get_user_use_cases),
+    response_cache: ResponseCache = Depends(get_response_cache)
+):
+    """Получить пользователя по ID с использованием кеша (для тестирования производительности)"""
+    return await cached_json_response(
+        response_cache,
+        response_cache.get_user_key(user_id),
+        lambda: build_user_response(user_use_cases, user_id)
+    )
+
+
 @router.get("/performance/users-no-cache/{user_id}", response_model=UserResponse, tags=["performance-testing"])
 async def get_user_without_cache(
     user_id: str,
@@ -79,24 +110,29 @@ async def get_user_without_cache(
 async def get_users_with_cache(
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
-    user_use_cases: UserUseCases = Depends(get_user_use_cases)
+    user_use_cases: UserUseCases = Depends(get_user_use_cases),
+    response_cache: ResponseCache = Depends(get_response_cache)
 ):
     """Получить список пользователей с использованием кеша (для тестирования производительности)"""
-    try:
-        users = await user_use_cases.get_all_users(limit, offset)
-        user_responses = [create_user_response(user) for user in users]
-        
-        return PaginatedUsersResponse(
-            users=user_responses,
-            total=len(users),
-            limit=limit,
-            offset=offset
-        )
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
+    async def build() -> PaginatedUsersResponse:
+        try:
+            users = await user_use_cases.get_all_users(limit, offset)
+            user_responses = [create_user_response(user) for user in users]
+            
+            return PaginatedUsersResponse(
+                users=user_responses,
+                total=await user_use_cases.count_users(),
+                limit=limit,
+                offset=offset
+            )
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+    
+    cache_key = await response_cache.get_list_key("performance", limit, offset)
+    return await cached_json_response(response_cache, cache_key, build)
 
 
 @router.get("/performance/users-no-cache", response_model=PaginatedUsersResponse, tags=["performance-testing"])
@@ -114,7 +150,7 @@ async def get_users_without_cache(
         
         return PaginatedUsersResponse(
             users=user_responses,
-            total=len(users),
+            total=await user_repository.count(),
             limit=limit,
             offset=offset
         )
@@ -175,6 +211,47 @@ async def create_user(
         )
 
 
+@router.post("/admin/users/bulk", response_model=BulkImportResponse, tags=["admin"])
+async def bulk_import_users(
+    request: Request,
+    data_format: Optional[str] = Query(
+        default=None, alias="format", pattern="^(csv|ndjson)$",
+        description="csv or ndjson; by default taken from Content-Type"
+    ),
+    batch_size: int = Query(default=1000, ge=1, le=10000),
+    warm_cache: bool = Query(default=False, description="Put created users into the cache"),
+    user_use_cases: UserUseCases = Depends(get_user_use_cases),
+    current_user: User = Depends(get_admin_user)  # Только админ может импортировать пользователей
+):
+    """Пакетный импорт пользователей из CSV/NDJSON (только для админа).
+    
+    Тело запроса читается потоком и обрабатывается пакетами по batch_size записей.
+    """
+    if data_format is None:
+        data_format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    
+    try:
+        result = await user_use_cases.import_users(
+            parse_records(request.stream(), data_format),
+            batch_size=batch_size,
+            warm_cache=warm_cache
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    return BulkImportResponse(
+        received=result.received,
+        created=result.created,
+        skipped=result.skipped,
+        rejected=result.rejected,
+        duration_seconds=round(result.duration_seconds, 3),
+        rows_per_second=round(result.rows_per_second, 1)
+    )
+
+
 @router.get("/users/me", response_model=UserResponse, tags=["users"])
 async def get_current_user_info(
     current_user: User = Depends(get_current_active_user)
@@ -187,25 +264,22 @@ async def get_current_user_info(
 async def get_user_by_id(
     user_id: str,
     user_use_cases: UserUseCases = Depends(get_user_use_cases),
+    response_cache: ResponseCache = Depends(get_response_cache),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить пользователя по ID"""
-    try:
-        # Пользователь может смотреть только свой профиль, админ - любой
-        if current_user.role != UserRole.ADMIN and current_user.id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions"
-            )
-        
-        user = await user_use_cases.get_user_by_id(user_id)
-        return create_user_response(user)
-        
-    except UserNotFound as e:
+    # Пользователь может смотреть только свой профиль, админ - любой
+    if current_user.role != UserRole.ADMIN and current_user.id != user_id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
         )
+    
+    return await cached_json_response(
+        response_cache,
+        response_cache.get_user_key(user_id),
+        lambda: build_user_response(user_use_cases, user_id)
+    )
 
 
 @router.get("/users", response_model=PaginatedUsersResponse, tags=["users"])
@@ -213,37 +287,53 @@ async def get_users(
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
     name: str = Query(default=None, description="Search by name"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from next_cursor of the previous page"),
     user_use_cases: UserUseCases = Depends(get_user_use_cases),
+    response_cache: ResponseCache = Depends(get_response_cache),
     current_user: User = Depends(get_admin_user)  # Только админ может просматривать всех пользователей
 ):
-    """Получить список пользователей (только для админа)"""
-    try:
-        if name:
-            users = await user_use_cases.search_users_by_name(name)
-            # Применяем пагинацию к результатам поиска
-            paginated_users = users[offset:offset + limit]
-            total = len(users)
-        else:
-            users = await user_use_cases.get_all_users(limit, offset)
-            paginated_users = users
-            # Для простоты считаем total как количество возвращенных записей
-            # В реальном приложении нужно делать отдельный запрос для подсчета
-            total = len(users)
-        
-        user_responses = [create_user_response(user) for user in paginated_users]
-        
-        return PaginatedUsersResponse(
-            users=user_responses,
-            total=total,
-            limit=limit,
-            offset=offset
-        )
-        
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
+    """Получить список пользователей (только для админа).
+    
+    С параметром cursor используется keyset-пагинация по (created_at, id):
+    offset игнорируется, стоимость запроса не зависит от глубины страницы.
+    """
+    async def build() -> PaginatedUsersResponse:
+        try:
+            next_cursor = None
+            if name:
+                # Страница поиска и количество результатов считаются в БД
+                paginated_users = await user_use_cases.search_users_by_name(name, limit, offset)
+                total = await user_use_cases.count_users_by_name(name)
+            elif cursor:
+                paginated_users, next_cursor = await user_use_cases.get_users_page(limit, cursor)
+                total = await user_use_cases.count_users()
+            else:
+                users = await user_use_cases.get_all_users(limit, offset)
+                paginated_users = users
+                # Счетчик берется из кеша и поддерживается записями, без COUNT(*) на каждый запрос
+                total = await user_use_cases.count_users()
+                # Полная страница: дальше можно листать курсором
+                if len(users) == limit:
+                    next_cursor = UserCursor.after(users[-1]).encode()
+            
+            user_responses = [create_user_response(user) for user in paginated_users]
+            
+            return PaginatedUsersResponse(
+                users=user_responses,
+                total=total,
+                limit=limit,
+                offset=offset,
+                next_cursor=next_cursor
+            )
+            
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+    
+    cache_key = await response_cache.get_list_key("users", limit, offset, cursor, name)
+    return await cached_json_response(response_cache, cache_key, build)
 
 
 @router.put("/users/{user_id}", response_model=UserResponse, tags=["users"])
@@ -1,4 +1,6 @@
-from typing import Optional
+import os
+from typing import Optional, AsyncIterator
+from contextlib import asynccontextmanager
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,7 +9,11 @@ from ..use_cases.user_use_cases import UserUseCases
 from ..infrastructure.repositories import SQLAlchemyUserRepository, SQLAlchemyUserProfileRepository
 from ..infrastructure.cached_repositories import CachedUserRepository, CachedUserProfileRepository
 from ..infrastructure.redis_client import get_redis_client, RedisClient
-from ..infrastructure.database import get_async_session
+from ..infrastructure.local_cache import user_local_cache
+from ..infrastructure.single_flight import user_single_flight
+from ..infrastructure.response_cache import ResponseCache, user_response_cache
+from ..infrastructure.password_hasher import password_hasher
+from ..infrastructure.database import get_async_session, async_session_maker
 from ..infrastructure.auth import JWTService, JWTConfig
 from ..domain.entities import User, UserRole
 from ..domain.exceptions import UserNotFound, InvalidCredentials
@@ -19,12 +25,22 @@ jwt_service = JWTService(jwt_config)
 # HTTP Bearer scheme для JWT
 security = HTTPBearer()
 
+# Режим подсчета total в списках: exact (кешированный COUNT) или estimate (pg_class.reltuples)
+USER_COUNT_ESTIMATE = os.getenv("USER_COUNT_MODE", "exact").lower() == "estimate"
+
 
 def get_jwt_service() -> JWTService:
     """Получить экземпляр JWTService"""
     return jwt_service
 
 
+@asynccontextmanager
+async def background_user_repository() -> AsyncIterator[SQLAlchemyUserRepository]:
+    """Репозиторий с собственной сессией для фоновых обновлений кеша"""
+    async with async_session_maker() as session:
+        yield SQLAlchemyUserRepository(session)
+
+
 async def get_user_use_cases(
     session: AsyncSession = Depends(get_async_session),
     redis_client: RedisClient = Depends(get_redis_client)
@@ -35,10 +51,27 @@ async def get_user_use_cases(
     db_user_profile_repository = SQLAlchemyUserProfileRepository(session)
     
     # Оборачиваем их в кеширующие репозитории
-    cached_user_repository = CachedUserRepository(db_user_repository, redis_client)
+    cached_user_repository = CachedUserRepository(
+        db_user_repository,
+        redis_client,
+        local_cache=user_local_cache,
+        single_flight=user_single_flight,
+        repository_factory=background_user_repository,
+        response_cache=user_response_cache
+    )
     cached_user_profile_repository = CachedUserProfileRepository(db_user_profile_repository, redis_client)
     
-    return UserUseCases(cached_user_repository, cached_user_profile_repository)
+    return UserUseCases(
+        cached_user_repository,
+        cached_user_profile_repository,
+        password_hasher,
+        count_estimate=USER_COUNT_ESTIMATE
+    )
+
+
+def get_response_cache() -> ResponseCache:
+    """Получить кеш готовых HTTP ответов пользователей"""
+    return user_response_cache
 
 
 async def get_current_user(
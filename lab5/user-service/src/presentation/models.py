@@ -59,8 +59,18 @@ class ErrorResponse(BaseModel):
     detail: Optional[str] = None
 
 
+class BulkImportResponse(BaseModel):
+    received: int
+    created: int
+    skipped: int
+    rejected: int
+    duration_seconds: float
+    rows_per_second: float
+
+
 class PaginatedUsersResponse(BaseModel):
     users: List[UserResponse]
     total: int
     limit: int
-    offset: int 
\ No newline at end of file
+    offset: int
+    next_cursor: Optional[str] = None  # курсор следующей страницы (keyset-пагинация) 
\ No newline at end of file
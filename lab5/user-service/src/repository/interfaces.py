@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from ..domain.entities import User, UserProfile
+from typing import Optional, List, Tuple
+from ..domain.entities import User, UserProfile, UserCursor
 
 
 class UserRepository(ABC):
@@ -11,6 +11,15 @@ class UserRepository(ABC):
         """Создать пользователя"""
         pass
     
+    @abstractmethod
+    async def bulk_create(self, users: List[User], warm_cache: bool = False) -> List[User]:
+        """Создать пользователей пакетом, пропуская конфликты по username/email.
+        
+        Возвращает только созданных пользователей; warm_cache - для кеширующих
+        реализаций сразу положить их в кеш.
+        """
+        pass
+    
     @abstractmethod
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Получить пользователя по ID"""
@@ -27,8 +36,13 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    async def search_by_name(self, name: str) -> List[User]:
-        """Поиск пользователей по имени"""
+    async def search_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[User]:
+        """Поиск пользователей по имени (страница результатов по убыванию релевантности)"""
+        pass
+    
+    @abstractmethod
+    async def count_by_name(self, name: str) -> int:
+        """Количество пользователей, найденных по имени"""
         pass
     
     @abstractmethod
@@ -36,15 +50,35 @@ class UserRepository(ABC):
         """Обновить пользователя"""
         pass
     
+    @abstractmethod
+    async def update_with_previous(self, user: User) -> Tuple[User, User]:
+        """Обновить пользователя и вернуть (состояние до обновления, после обновления)"""
+        pass
+    
     @abstractmethod
     async def delete(self, user_id: str) -> bool:
         """Удалить пользователя"""
         pass
     
+    @abstractmethod
+    async def delete_returning(self, user_id: str) -> Optional[User]:
+        """Удалить пользователя и вернуть удаленную запись (None, если ее не было)"""
+        pass
+    
     @abstractmethod
     async def get_all(self, limit: int = 100, offset: int = 0) -> List[User]:
         """Получить всех пользователей с пагинацией"""
         pass
+    
+    @abstractmethod
+    async def count(self, estimate: bool = False) -> int:
+        """Количество пользователей (estimate - допускается приближенное значение)"""
+        pass
+    
+    @abstractmethod
+    async def get_page(self, limit: int = 100, after: Optional[UserCursor] = None) -> List[User]:
+        """Получить страницу пользователей после курсора в порядке (created_at, id)"""
+        pass
 
 
 class UserProfileRepository(ABC):
@@ -68,4 +102,23 @@ class UserProfileRepository(ABC):
     @abstractmethod
     async def delete(self, user_id: str) -> bool:
         """Удалить профиль пользователя"""
-        pass 
\ No newline at end of file
+        pass
+
+
+class PasswordHasher(ABC):
+    """Абстракция сервиса хеширования паролей"""
+    
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        """Хеш пароля"""
+        pass
+    
+    @abstractmethod
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Проверить пароль по хешу"""
+        pass
+    
+    @abstractmethod
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Хеши нескольких паролей"""
+        pass
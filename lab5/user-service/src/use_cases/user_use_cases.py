@@ -1,24 +1,44 @@
-from typing import Optional, List
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Tuple, AsyncIterable
 from datetime import datetime
-import bcrypt
 import jwt
-from uuid import uuid4
+from uuid import uuid4, UUID
 
-from ..repository.interfaces import UserRepository, UserProfileRepository
-from ..domain.entities import User, UserProfile, UserRole
+from ..repository.interfaces import UserRepository, UserProfileRepository, PasswordHasher
+from ..domain.entities import User, UserProfile, UserRole, UserCursor
 from ..domain.exceptions import UserNotFound, DuplicateUser, InvalidCredentials, ValidationError
 
 
+@dataclass
+class BulkImportResult:
+    """Итог пакетного импорта пользователей"""
+    received: int = 0   # записей во входных данных
+    created: int = 0    # создано пользователей
+    skipped: int = 0    # пропущено из-за конфликта username/email
+    rejected: int = 0   # отклонено валидацией
+    duration_seconds: float = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Скорость обработки входных записей"""
+        return self.received / self.duration_seconds if self.duration_seconds > 0 else 0.0
+
+
 class UserUseCases:
     """Use Cases для управления пользователями"""
     
     def __init__(
         self, 
         user_repository: UserRepository,
-        user_profile_repository: UserProfileRepository
+        user_profile_repository: UserProfileRepository,
+        password_hasher: PasswordHasher,
+        count_estimate: bool = False
     ):
         self._user_repository = user_repository
         self._user_profile_repository = user_profile_repository
+        self._password_hasher = password_hasher
+        self._count_estimate = count_estimate  # total по оценке планировщика вместо точного счетчика
     
     async def create_user(
         self, 
@@ -45,8 +65,8 @@ class UserUseCases:
         if len(password) < 6:
             raise ValidationError("Password must be at least 6 characters long")
         
-        # Хэширование пароля
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        # Хэширование пароля (в пуле потоков, не блокируя event loop)
+        hashed_password = await self._password_hasher.hash(password)
         
         # Создание пользователя
         user = User(
@@ -72,7 +92,7 @@ class UserUseCases:
             raise InvalidCredentials("User account is deactivated")
         
         # Проверка пароля
-        if not bcrypt.checkpw(password.encode('utf-8'), user.hashed_password.encode('utf-8')):
+        if not await self._password_hasher.verify(password, user.hashed_password):
             raise InvalidCredentials("Invalid username or password")
         
         return user
@@ -93,12 +113,25 @@ class UserUseCases:
         
         return user
     
-    async def search_users_by_name(self, name: str) -> List[User]:
-        """Поиск пользователей по имени"""
+    async def search_users_by_name(self, name: str, limit: int = 50, offset: int = 0) -> List[User]:
+        """Поиск пользователей по имени (страница результатов по релевантности)"""
+        if not name or len(name.strip()) < 2:
+            raise ValidationError("Search name must be at least 2 characters long")
+        
+        if limit < 1 or limit > 1000:
+            raise ValidationError("Limit must be between 1 and 1000")
+        
+        if offset < 0:
+            raise ValidationError("Offset must be non-negative")
+        
+        return await self._user_repository.search_by_name(name.strip(), limit, offset)
+    
+    async def count_users_by_name(self, name: str) -> int:
+        """Количество пользователей, найденных по имени"""
         if not name or len(name.strip()) < 2:
             raise ValidationError("Search name must be at least 2 characters long")
         
-        return await self._user_repository.search_by_name(name.strip())
+        return await self._user_repository.count_by_name(name.strip())
     
     async def get_all_users(self, limit: int = 100, offset: int = 0) -> List[User]:
         """Получить всех пользователей с пагинацией"""
@@ -110,6 +143,35 @@ class UserUseCases:
         
         return await self._user_repository.get_all(limit, offset)
     
+    async def count_users(self) -> int:
+        """Общее количество пользователей для пагинации"""
+        return await self._user_repository.count(self._count_estimate)
+    
+    async def get_users_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """Получить страницу пользователей после курсора и курсор следующей страницы"""
+        if limit < 1 or limit > 1000:
+            raise ValidationError("Limit must be between 1 and 1000")
+        
+        after = None
+        if cursor:
+            try:
+                after = UserCursor.decode(cursor)
+                UUID(after.id)
+            except (ValueError, UnicodeDecodeError):
+                raise ValidationError("Invalid cursor")
+        
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+        users = await self._user_repository.get_page(limit + 1, after)
+        if len(users) <= limit:
+            return users, None
+        
+        users = users[:limit]
+        return users, UserCursor.after(users[-1]).encode()
+    
     async def update_user(
         self, 
         user_id: str, 
@@ -142,19 +204,109 @@ class UserUseCases:
         user = await self.get_user_by_id(user_id)
         
         # Проверка старого пароля
-        if not bcrypt.checkpw(old_password.encode('utf-8'), user.hashed_password.encode('utf-8')):
+        if not await self._password_hasher.verify(old_password, user.hashed_password):
             raise InvalidCredentials("Invalid current password")
         
         if len(new_password) < 6:
             raise ValidationError("New password must be at least 6 characters long")
         
         # Хэширование нового пароля
-        user.hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        user.hashed_password = await self._password_hasher.hash(new_password)
         user.updated_at = datetime.utcnow()
         
         await self._user_repository.update(user)
         return True
     
+    async def import_users(
+        self,
+        records: AsyncIterable[dict],
+        batch_size: int = 1000,
+        warm_cache: bool = False
+    ) -> BulkImportResult:
+        """Пакетный импорт пользователей из потока записей.
+        
+        Запись содержит username, email, full_name, role и password (или готовый
+        bcrypt hashed_password). Пароли пакета хешируются параллельно через
+        PasswordHasher, пакет вставляется одним bulk_create; конфликты пропускаются.
+        """
+        if batch_size < 1 or batch_size > 10000:
+            raise ValidationError("Batch size must be between 1 and 10000")
+        
+        result = BulkImportResult()
+        started = time.perf_counter()
+        batch: List[dict] = []
+        
+        async for record in records:
+            result.received += 1
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await self._import_batch(batch, result, warm_cache)
+                batch = []
+        if batch:
+            await self._import_batch(batch, result, warm_cache)
+        
+        result.duration_seconds = time.perf_counter() - started
+        return result
+    
+    async def _import_batch(self, records: List[dict], result: BulkImportResult, warm_cache: bool):
+        """Проверить, захешировать и вставить один пакет"""
+        users: List[User] = []
+        passwords: List[Optional[str]] = []
+        for record in records:
+            user, password = self._user_from_import_record(record)
+            if user is None:
+                result.rejected += 1
+                continue
+            users.append(user)
+            passwords.append(password)
+        
+        # Хеши пакета считаются параллельно в пуле сервиса хеширования
+        hashes = await self._password_hasher.hash_many(
+            [password for password in passwords if password is not None]
+        )
+        hashes_iter = iter(hashes)
+        for user, password in zip(users, passwords):
+            if password is not None:
+                user.hashed_password = next(hashes_iter)
+        
+        created = await self._user_repository.bulk_create(users, warm_cache)
+        result.created += len(created)
+        result.skipped += len(users) - len(created)
+    
+    def _user_from_import_record(self, record: dict) -> Tuple[Optional[User], Optional[str]]:
+        """Пользователь и пароль для хеширования из записи импорта (None, если запись некорректна)"""
+        username = str(record.get("username") or "").strip()
+        email = str(record.get("email") or "").strip()
+        full_name = str(record.get("full_name") or "").strip()
+        password = record.get("password")
+        hashed_password = record.get("hashed_password")
+        
+        if not (3 <= len(username) <= 50) or "@" not in email or len(email) > 100 or not full_name:
+            return None, None
+        try:
+            role = UserRole(record.get("role") or UserRole.CLIENT.value)
+        except ValueError:
+            return None, None
+        
+        if hashed_password:
+            # Готовый хеш принимается только в формате bcrypt
+            if not str(hashed_password).startswith("$2"):
+                return None, None
+            password = None
+        elif not password or len(str(password)) < 6:
+            return None, None
+        
+        user = User(
+            id=str(uuid4()),
+            username=username,
+            email=email,
+            full_name=full_name,
+            hashed_password=str(hashed_password or ""),
+            role=role,
+            is_active=str(record.get("is_active", True)).lower() not in ("false", "0", "no")
+        )
+        return user, str(password) if password is not None else None
+    
     async def delete_user(self, user_id: str) -> bool:
         """Удалить пользователя"""
         user = await self.get_user_by_id(user_id)